@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, '/app/npc_system')
 
 from core.npc_system import NPCSystem
+from core.limbic import rounded_summary
 
 # Router for NPC endpoints
 npc_router = APIRouter(prefix="/npc", tags=["npc"])
@@ -121,7 +122,7 @@ async def get_npc_status(npc_id: str):
             raise HTTPException(status_code=404, detail=f"NPC '{npc_id}' not found")
         
         npc = npc_instances[npc_id]
-        limbic_state = npc.limbic.get_state_summary()
+        limbic_state = rounded_summary(npc.limbic.get_state_summary())
         
         return NPCStatusResponse(
             npc_id=npc_id,
@@ -1,6 +1,5 @@
 """Cognitive Brain - LLM Integration & Decision Making (Step 3)"""
 import os
-import json
 import asyncio
 from datetime import datetime
 from typing import Dict, Optional, List
@@ -110,10 +109,8 @@ Respond with your cognitive frame in JSON format as instructed."""
         
         # Query LLM
         try:
-            response = await self.llm.send_message(UserMessage(text=prompt))
-            
-            # Parse JSON
-            cognitive_frame = json.loads(response)
+            # Schema-constrained output, already parsed
+            cognitive_frame = await self.llm.send_structured_async(prompt)
             
             # Validate required fields
             required = ["internal_reflection", "intent", "dialogue", "urgency", "emotional_state"]
@@ -150,7 +147,7 @@ Generate a single-sentence belief or insight based on these memories.
 Respond ONLY with the belief text, no JSON, no extra formatting."""
         
         try:
-            belief = await self.llm.send_message(UserMessage(text=prompt))
+            belief = await self.llm.send_user_message(UserMessage(text=prompt))
             self.memory_vault.save_summary_belief(self.npc_id, belief.strip(), strength=0.7)
             print(f"  ✓ New Belief: '{belief.strip()}'")
         except Exception as e:
@@ -371,7 +371,7 @@ Consider:
         context = self._build_orchestrator_context(group, message)
         
         try:
-            response = await self._orchestrator_llm.send_message(UserMessage(text=context))
+            response = await self._orchestrator_llm.send_user_message(UserMessage(text=context))
             result = json.loads(response)
             
             # Update tension
@@ -679,11 +679,14 @@ Determine which NPC(s) should respond and how."""
     async def generate_voice_for_responses(
         self,
         responses: List[ConversationMessage],
-        audio_format: str = "wav"
+        audio_format: str = "wav",
+        encode_base64: bool = True
     ) -> List[Dict]:
         """
         Generate voice audio for each NPC response in the conversation.
         Returns list of audio data with NPC metadata.
+        With encode_base64=False the audio is returned raw under "audio_bytes"
+        instead of "audio_base64".
         """
         if not hasattr(self, 'voice_system') or not self.voice_system:
             return []
@@ -704,7 +707,8 @@ Determine which NPC(s) should respond and how."""
                     npc_id=npc_id,
                     text=resp.content,
                     mood=mood,
-                    output_format=audio_format
+                    output_format=audio_format,
+                    encode_base64=encode_base64
                 )
                 
                 if audio_result and audio_result.get("audio"):
@@ -713,7 +717,7 @@ Determine which NPC(s) should respond and how."""
                         "npc_name": resp.speaker_name,
                         "dialogue": resp.content,
                         "response_type": resp.response_type.value if isinstance(resp.response_type, ResponseType) else resp.response_type,
-                        "audio_base64": audio_result.get("audio"),
+                        "audio_base64" if encode_base64 else "audio_bytes": audio_result.get("audio"),
                         "format": audio_format,
                         "duration_ms": audio_result.get("duration_ms", 0),
                         "voice_id": audio_result.get("voice_id", ""),
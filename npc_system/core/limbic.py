@@ -5,40 +5,62 @@ from datetime import datetime
 from typing import Dict
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class Vitals:
     """NPC biological constraints"""
     hunger: float = 0.2  # 0.0 = full, 1.0 = starving
     fatigue: float = 0.3  # 0.0 = rested, 1.0 = exhausted
     
+    STARVE_SECONDS = 14400  # 4 hours to starve
+    EXHAUST_SECONDS = 21600  # 6 hours to exhaust
+    
     def decay(self, delta_seconds: float):
         """Natural vitals decay over time"""
-        self.hunger = min(1.0, self.hunger + (delta_seconds / 14400))  # 4 hours to starve
-        self.fatigue = min(1.0, self.fatigue + (delta_seconds / 21600))  # 6 hours to exhaust
+        self.hunger = min(1.0, self.hunger + (delta_seconds / self.STARVE_SECONDS))
+        self.fatigue = min(1.0, self.fatigue + (delta_seconds / self.EXHAUST_SECONDS))
 
-@dataclass
+@dataclass(slots=True)
 class EmotionalState:
     """NPC emotional state"""
     mood: str = "Calm"  # Calm, Paranoid, Aggressive, Fearful, Happy
     arousal: float = 0.5  # 0.0 = lethargic, 1.0 = panicked
     valence: float = 0.5  # 0.0 = negative, 1.0 = positive
     
+    # Decay towards baseline applied after every event
+    _AROUSAL_DECAY = 0.95
+    _VALENCE_DECAY = 0.9
+    _VALENCE_BASELINE = 0.5
+    
+    @staticmethod
+    def _apply_threat(state: "EmotionalState", intensity: float):
+        state.arousal = min(1.0, state.arousal + intensity)
+        state.valence = max(0.0, state.valence - intensity)
+        if state.arousal > 0.7:
+            state.mood = "Paranoid"
+    
+    @staticmethod
+    def _apply_positive(state: "EmotionalState", intensity: float):
+        state.valence = min(1.0, state.valence + intensity)
+        state.arousal = max(0.0, state.arousal - intensity * 0.5)
+        if state.valence > 0.7:
+            state.mood = "Happy"
+    
+    @staticmethod
+    def _apply_none(state: "EmotionalState", intensity: float):
+        pass
+    
+    _HANDLERS = {
+        "threat": _apply_threat,
+        "positive": _apply_positive,
+    }
+    
     def update_from_event(self, event_type: str, intensity: float):
         """Update emotional state based on events"""
-        if event_type == "threat":
-            self.arousal = min(1.0, self.arousal + intensity)
-            self.valence = max(0.0, self.valence - intensity)
-            if self.arousal > 0.7:
-                self.mood = "Paranoid"
-        elif event_type == "positive":
-            self.valence = min(1.0, self.valence + intensity)
-            self.arousal = max(0.0, self.arousal - intensity * 0.5)
-            if self.valence > 0.7:
-                self.mood = "Happy"
+        self._HANDLERS.get(event_type, self._apply_none)(self, intensity)
         
         # Natural decay towards baseline
-        self.arousal = self.arousal * 0.95
-        self.valence = 0.5 + (self.valence - 0.5) * 0.9
+        self.arousal = self.arousal * self._AROUSAL_DECAY
+        self.valence = self._VALENCE_BASELINE + (self.valence - self._VALENCE_BASELINE) * self._VALENCE_DECAY
 
 class LimbicSystem:
     """Manages emotions, vitals, and autonomous reflection (Thread B)"""
@@ -47,33 +69,45 @@ class LimbicSystem:
         self.npc_id = npc_id
         self.vitals = Vitals()
         self.emotional_state = EmotionalState()
-        self.last_reflection_time = time.time()
+        self.last_reflection_time = time.monotonic()
         self.reflection_interval = 300  # 300 seconds (5 minutes)
         self.running = False
+        # Set when the orchestrator decays vitals for all NPCs in one batch
+        self.vitals_managed = False
+        # (arousal, think time) of the last get_think_time computation
+        self._think_cache = (None, None)
     
     def get_think_time(self) -> float:
         """Simulated sensory latency based on arousal"""
-        if self.emotional_state.arousal > 0.8:
-            return 0.1  # Nearly instant when panicked
-        elif self.emotional_state.arousal < 0.3:
-            return 2.0  # Slow when calm
+        arousal = self.emotional_state.arousal
+        cached_arousal, cached_value = self._think_cache
+        if arousal == cached_arousal:
+            return cached_value
+        
+        if arousal > 0.8:
+            value = 0.1  # Nearly instant when panicked
+        elif arousal < 0.3:
+            value = 2.0  # Slow when calm
         else:
-            return 1.0  # Normal
+            value = 1.0  # Normal
+        self._think_cache = (arousal, value)
+        return value
     
     def needs_reflection(self) -> bool:
         """Check if autonomous reflection is due"""
-        return (time.time() - self.last_reflection_time) >= self.reflection_interval
+        return (time.monotonic() - self.last_reflection_time) >= self.reflection_interval
     
     async def autonomous_loop(self, brain_callback):
         """Thread B: Background vitals decay & autonomous reflection"""
         self.running = True
-        last_decay = time.time()
+        last_decay = time.monotonic()
         
         while self.running:
             # Vitals decay
-            now = time.time()
+            now = time.monotonic()
             delta = now - last_decay
-            self.vitals.decay(delta)
+            if not self.vitals_managed:
+                self.vitals.decay(delta)
             last_decay = now
             
             # Check for autonomous reflection
@@ -89,16 +123,33 @@ class LimbicSystem:
         self.running = False
     
     def get_state_summary(self) -> Dict:
-        """Get current limbic state"""
+        """Get current limbic state (full precision; format at display time)"""
         return {
             "vitals": {
-                "hunger": round(self.vitals.hunger, 2),
-                "fatigue": round(self.vitals.fatigue, 2)
+                "hunger": self.vitals.hunger,
+                "fatigue": self.vitals.fatigue
             },
             "emotional_state": {
                 "mood": self.emotional_state.mood,
-                "arousal": round(self.emotional_state.arousal, 2),
-                "valence": round(self.emotional_state.valence, 2)
+                "arousal": self.emotional_state.arousal,
+                "valence": self.emotional_state.valence
             },
-            "think_time": round(self.get_think_time(), 2)
+            "think_time": self.get_think_time()
         }
+
+def rounded_summary(summary: Dict, ndigits: int = 2) -> Dict:
+    """Copy of a state summary with display rounding, for API responses"""
+    vitals = summary["vitals"]
+    emotional = summary["emotional_state"]
+    return {
+        "vitals": {
+            "hunger": round(vitals["hunger"], ndigits),
+            "fatigue": round(vitals["fatigue"], ndigits)
+        },
+        "emotional_state": {
+            "mood": emotional["mood"],
+            "arousal": round(emotional["arousal"], ndigits),
+            "valence": round(emotional["valence"], ndigits)
+        },
+        "think_time": round(summary["think_time"], ndigits)
+    }
@@ -4,8 +4,14 @@ This module provides a drop-in replacement for the emergentintegrations.llm.chat
 """
 import os
 import json
-from typing import Optional, Dict, Any, List
+import atexit
+import asyncio
+from collections import deque
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, AsyncIterator
 from dataclasses import dataclass
+import httpx
+import orjson
 from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
 
@@ -13,14 +19,102 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Support both old and new env var names
+@lru_cache(maxsize=1)
 def get_api_key() -> str:
-    """Get OpenAI API key from environment (supports legacy EMERGENT_LLM_KEY)"""
+    """
+    Get OpenAI API key from environment (supports legacy EMERGENT_LLM_KEY).
+    Resolved once per process; call get_api_key.cache_clear() after changing the env.
+    """
     key = os.environ.get("OPENAI_API_KEY") or os.environ.get("EMERGENT_LLM_KEY")
     if not key:
         raise ValueError("No API key found. Set OPENAI_API_KEY or EMERGENT_LLM_KEY")
     return key
 
 
+# Structured-output schema for NPC cognitive frames (see CognitiveBrain prompt)
+COGNITIVE_FRAME_SCHEMA = {
+    "name": "cognitive_frame",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "internal_reflection": {"type": "string"},
+            "intent": {
+                "type": "string",
+                "enum": ["Investigate", "Flee", "Assist", "Ignore", "Socialize", "Guard", "Trade"]
+            },
+            "dialogue": {"type": "string"},
+            "urgency": {"type": "number"},
+            "trust_mod": {"type": "number"},
+            "emotional_state": {"type": "string"}
+        },
+        "required": [
+            "internal_reflection", "intent", "dialogue",
+            "urgency", "trust_mod", "emotional_state"
+        ],
+        "additionalProperties": False
+    }
+}
+
+
+# Shared clients keyed by API key, so every chat session reuses one connection pool
+_SYNC_CLIENTS: Dict[str, OpenAI] = {}
+_ASYNC_CLIENTS: Dict[str, AsyncOpenAI] = {}
+
+# One HTTP/2 keep-alive pool shared by all async clients, created on first use
+_HTTPX: Optional[httpx.AsyncClient] = None
+
+
+def _get_sync(api_key: str) -> OpenAI:
+    """Get the shared sync OpenAI client for an API key"""
+    client = _SYNC_CLIENTS.get(api_key)
+    if client is None:
+        client = _SYNC_CLIENTS.setdefault(api_key, OpenAI(api_key=api_key))
+    return client
+
+
+def _get_async(api_key: str) -> AsyncOpenAI:
+    """Get the shared async OpenAI client for an API key"""
+    client = _ASYNC_CLIENTS.get(api_key)
+    if client is None:
+        client = _ASYNC_CLIENTS.setdefault(
+            api_key, AsyncOpenAI(api_key=api_key, http_client=_get_httpx())
+        )
+    return client
+
+
+def _get_httpx() -> httpx.AsyncClient:
+    """Get the shared HTTP/2 connection pool for async OpenAI clients"""
+    global _HTTPX
+    if _HTTPX is None:
+        _HTTPX = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+    return _HTTPX
+
+
+async def aclose_clients():
+    """Close the shared async connection pool (call on app shutdown)"""
+    global _HTTPX
+    if _HTTPX is not None:
+        _ASYNC_CLIENTS.clear()
+        await _HTTPX.aclose()
+        _HTTPX = None
+
+
+@atexit.register
+def _close_clients_at_exit():
+    """Fallback close when the app exits without a shutdown hook"""
+    if _HTTPX is None:
+        return
+    try:
+        asyncio.run(aclose_clients())
+    except Exception:
+        pass  # Loop-bound transports may already be gone at interpreter exit
+
+
 @dataclass
 class UserMessage:
     """Compatible with emergentintegrations.llm.chat.UserMessage"""
@@ -52,6 +146,9 @@ class LlmChat:
         "gpt-3.5-turbo": "gpt-3.5-turbo",
     }
     
+    # Non-system turns kept in context; older turns fall off the front
+    HISTORY_LIMIT = 32
+    
     def __init__(
         self, 
         api_key: Optional[str] = None,
@@ -62,18 +159,19 @@ class LlmChat:
         self.session_id = session_id
         self.system_message = system_message
         self.model = "gpt-4o"  # Default model
-        self.messages: List[Dict[str, str]] = []
+        self.system: Optional[Dict[str, str]] = None
+        self.history: deque = deque(maxlen=self.HISTORY_LIMIT)
         
-        # Initialize OpenAI client
-        self._client = OpenAI(api_key=self.api_key)
-        self._async_client = AsyncOpenAI(api_key=self.api_key)
+        # Shared OpenAI clients (one connection pool per API key)
+        self._client = _get_sync(self.api_key)
+        self._async_client = _get_async(self.api_key)
         
-        # Add system message if provided
+        # System message is stored separately so trimming never drops it
         if system_message:
-            self.messages.append({
+            self.system = {
                 "role": "system",
                 "content": system_message
-            })
+            }
     
     def with_model(self, provider: str, model: str) -> 'LlmChat':
         """Set the model to use (compatible with Emergent API)"""
@@ -86,10 +184,48 @@ class LlmChat:
     
     def add_message(self, role: str, content: str):
         """Add a message to the conversation history"""
-        self.messages.append({"role": role, "content": content})
+        self.history.append({"role": role, "content": content})
+    
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """Messages sent with each request: system prompt + bounded history"""
+        if self.system:
+            return [self.system, *self.history]
+        return list(self.history)
+    
+    async def stream_message(self, message: str) -> AsyncIterator[str]:
+        """Send a message and yield the response text as it arrives"""
+        self.add_message("user", message)
+        parts: List[str] = []
+        
+        try:
+            stream = await self._async_client.chat.completions.create(
+                model=self.model,
+                messages=self.messages,
+                temperature=0.7,
+                max_tokens=1024,
+                stream=True
+            )
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    parts.append(content)
+                    yield content
+                    
+        except Exception as e:
+            raise Exception(f"LLM API Error: {str(e)}")
+        
+        self.add_message("assistant", "".join(parts))
     
     async def send_message_async(self, message: str) -> str:
-        """Send a message asynchronously and get the response"""
+        """Send a message asynchronously and get the response
+        
+        One non-streamed completion; use stream_message to consume text as it
+        arrives.
+        """
         self.add_message("user", message)
         
         try:
@@ -107,6 +243,31 @@ class LlmChat:
         except Exception as e:
             raise Exception(f"LLM API Error: {str(e)}")
     
+    async def send_structured_async(
+        self,
+        message: str,
+        schema: Dict[str, Any] = COGNITIVE_FRAME_SCHEMA
+    ) -> Dict[str, Any]:
+        """Send a message and get a JSON response constrained to a schema"""
+        self.add_message("user", message)
+        
+        try:
+            response = await self._async_client.chat.completions.create(
+                model=self.model,
+                messages=self.messages,
+                temperature=0.7,
+                max_tokens=1024,
+                response_format={"type": "json_schema", "json_schema": schema}
+            )
+            
+            assistant_message = response.choices[0].message.content
+            self.add_message("assistant", assistant_message)
+            
+        except Exception as e:
+            raise Exception(f"LLM API Error: {str(e)}")
+        
+        return orjson.loads(assistant_message)
+    
     def send_message(self, message: str) -> str:
         """Send a message synchronously and get the response"""
         self.add_message("user", message)
@@ -132,10 +293,7 @@ class LlmChat:
     
     def reset_conversation(self):
         """Clear conversation history but keep system message"""
-        if self.messages and self.messages[0]["role"] == "system":
-            self.messages = [self.messages[0]]
-        else:
-            self.messages = []
+        self.history.clear()
 
 
 class OpenAISpeechToText:
@@ -146,8 +304,8 @@ class OpenAISpeechToText:
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or get_api_key()
-        self._client = OpenAI(api_key=self.api_key)
-        self._async_client = AsyncOpenAI(api_key=self.api_key)
+        self._client = _get_sync(self.api_key)
+        self._async_client = _get_async(self.api_key)
     
     async def transcribe_async(
         self, 
@@ -213,7 +371,7 @@ async def complete_async(
     api_key: Optional[str] = None
 ) -> str:
     """Simple async completion without maintaining conversation"""
-    client = AsyncOpenAI(api_key=api_key or get_api_key())
+    client = _get_async(api_key or get_api_key())
     
     messages = []
     if system_message:
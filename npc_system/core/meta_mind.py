@@ -1,6 +1,14 @@
 """Meta-Mind - Executive Function & Conflict Resolution"""
+import sys
 from typing import Dict
-from datetime import datetime
+
+from core.timestamp import now_iso
+
+# Intents that survive vitals overrides (interned so hits compare by identity)
+_INVESTIGATE = sys.intern("Investigate")
+_IGNORE = sys.intern("Ignore")
+_HUNGER_SAFE = frozenset({sys.intern("Flee"), sys.intern("Assist")})
+_FATIGUE_SAFE = frozenset({sys.intern("Flee")})
 
 class MetaMind:
     """Executive function that consolidates subsystems and resolves conflicts"""
@@ -29,7 +37,7 @@ class MetaMind:
             npc_id=self.npc_id,
             delta=drift,
             reason=f"Event impact: {event_impact:+.2f}",
-            timestamp=datetime.now().isoformat(),
+            timestamp=now_iso(),
             current_value=new_value
         )
         
@@ -48,14 +56,14 @@ class MetaMind:
         fatigue = limbic_state["vitals"]["fatigue"]
         
         # Critical hunger overrides most actions
-        if hunger > 0.8 and intent not in ["Flee", "Assist"]:
-            cognitive_frame["intent"] = "Investigate"  # Search for food
+        if hunger > 0.8 and intent not in _HUNGER_SAFE:
+            cognitive_frame["intent"] = _INVESTIGATE  # Search for food
             cognitive_frame["internal_reflection"] += " [Meta: Hunger override - must find food]"
             cognitive_frame["urgency"] = max(urgency, 0.9)
         
         # Critical fatigue forces rest
-        if fatigue > 0.9 and intent not in ["Flee"]:
-            cognitive_frame["intent"] = "Ignore"  # Must rest
+        if fatigue > 0.9 and intent not in _FATIGUE_SAFE:
+            cognitive_frame["intent"] = _IGNORE  # Must rest
             cognitive_frame["dialogue"] = "I... need to rest..."
             cognitive_frame["urgency"] = 1.0
         
@@ -1,10 +1,17 @@
 """Multi-NPC Orchestration System - Phase 3"""
 import asyncio
-from typing import Dict, List, Set
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Set
 from dataclasses import dataclass
-from datetime import datetime
 
-@dataclass
+import numpy as np
+
+from core.limbic import Vitals
+from core.timestamp import now_iso
+
+@dataclass(slots=True)
 class NPCInteraction:
     """Record of interaction between NPCs"""
     from_npc: str
@@ -18,24 +25,45 @@ class MultiNPCOrchestrator:
     
     def __init__(self):
         self.npcs: Dict = {}  # npc_id -> NPCSystem instance
-        self.trust_matrix: Dict[str, Dict[str, float]] = {}  # npc1 -> npc2 -> trust_value
-        self.interaction_history: List[NPCInteraction] = []
+        # Dense trust matrix: _trust[i, j] = trust from npc i towards npc j
+        self._idx: Dict[str, int] = {}  # npc_id -> row/column in _trust
+        self._trust = np.full((16, 16), 0.5, dtype=np.float64)
+        # Bounded so long-running simulations don't grow without limit
+        self.interaction_history: Deque[NPCInteraction] = deque(maxlen=10_000)
         self.factions: Dict[str, Set[str]] = {
             "guards": set(),
             "traders": set(),
             "citizens": set()
         }
+        self._npc_faction: Dict[str, str] = {}  # npc_id -> faction name
+        # Trust memories are written in batches by a background flusher
+        self._mem_queue: asyncio.Queue = asyncio.Queue()
+        self._flusher = None
+        # Vitals as parallel arrays (same index as _trust), decayed in one tick
+        self._hunger = np.zeros(16, dtype=np.float64)
+        self._fatigue = np.zeros(16, dtype=np.float64)
+        self._vitals: List = []  # index -> Vitals object mirrored after each tick
+        self._vitals_task = None
+        # Caps concurrent LLM-backed interactions during broadcasts
+        self._llm_sem = asyncio.Semaphore(8)
+    
+    async def start(self):
+        """Orchestrator startup - must be awaited on the serving event loop"""
+        # Eager tasks run synchronously until their first real suspension,
+        # skipping a scheduler round-trip for coroutines that finish without I/O
+        if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
     
     def register_npc(self, npc_id: str, npc_instance, faction: str = "citizens"):
         """Register an NPC in the orchestrator"""
         self.npcs[npc_id] = npc_instance
         self.factions[faction].add(npc_id)
+        self._npc_faction[npc_id] = faction
         
         # Initialize trust with other NPCs
-        if npc_id not in self.trust_matrix:
-            self.trust_matrix[npc_id] = {}
+        i = self._slot(npc_id)
         
-        for other_npc in self.npcs.keys():
+        for other_npc, j in self._idx.items():
             if other_npc != npc_id:
                 # Same faction = higher initial trust
                 if self._same_faction(npc_id, other_npc):
@@ -43,46 +71,188 @@ class MultiNPCOrchestrator:
                 else:
                     initial_trust = 0.3
                 
-                self.trust_matrix[npc_id][other_npc] = initial_trust
-                
                 # Reciprocal trust
-                if other_npc not in self.trust_matrix:
-                    self.trust_matrix[other_npc] = {}
-                self.trust_matrix[other_npc][npc_id] = initial_trust
+                self._trust[i, j] = initial_trust
+                self._trust[j, i] = initial_trust
+        
+        self._bind_vitals(i, getattr(npc_instance, "limbic", None))
+    
+    def _slot(self, npc_id: str) -> int:
+        """Get (or assign) the trust matrix index of an NPC"""
+        i = self._idx.get(npc_id)
+        if i is None:
+            i = len(self._idx)
+            cap = self._trust.shape[0]
+            if i >= cap:
+                # Double capacity, keeping existing trust values
+                grown = np.full((cap * 2, cap * 2), 0.5, dtype=np.float64)
+                grown[:cap, :cap] = self._trust
+                self._trust = grown
+                pad = np.zeros(cap, dtype=np.float64)
+                self._hunger = np.concatenate((self._hunger, pad))
+                self._fatigue = np.concatenate((self._fatigue, pad))
+            self._idx[npc_id] = i
+            self._vitals.append(None)
+        return i
+    
+    def _bind_vitals(self, i: int, limbic):
+        """Seed an NPC's vitals slot and take over its decay if we can tick"""
+        vitals = limbic.vitals if limbic is not None else None
+        self._vitals[i] = vitals
+        if vitals is None:
+            return
+        self._hunger[i] = vitals.hunger
+        self._fatigue[i] = vitals.fatigue
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop to tick on - NPC keeps decaying its own vitals
+        if self._vitals_task is None or self._vitals_task.done():
+            self._vitals_task = asyncio.create_task(self._vitals_loop())
+        limbic.vitals_managed = True
+    
+    def tick_vitals(self, delta_seconds: float):
+        """Decay vitals of every registered NPC in one vectorized step"""
+        n = len(self._idx)
+        if n == 0:
+            return
+        hunger = self._hunger[:n]
+        fatigue = self._fatigue[:n]
+        # Vitals objects stay the source of truth: pull values first so changes
+        # made since the last tick (eating, resting) aren't overwritten below
+        vitals_list = self._vitals
+        hunger[:] = [v.hunger if v is not None else h for v, h in zip(vitals_list, hunger.tolist())]
+        fatigue[:] = [v.fatigue if v is not None else f for v, f in zip(vitals_list, fatigue.tolist())]
+        np.minimum(1.0, hunger + delta_seconds / Vitals.STARVE_SECONDS, out=hunger)
+        np.minimum(1.0, fatigue + delta_seconds / Vitals.EXHAUST_SECONDS, out=fatigue)
+        
+        # Mirror back so LimbicSystem summaries stay current
+        for vitals, h, f in zip(vitals_list, hunger.tolist(), fatigue.tolist()):
+            if vitals is not None:
+                vitals.hunger = h
+                vitals.fatigue = f
+    
+    async def _vitals_loop(self):
+        """Single decay loop replacing the per-NPC decay in autonomous loops"""
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(1)
+            now = time.monotonic()
+            self.tick_vitals(now - last)
+            last = now
+    
+    @property
+    def trust_matrix(self) -> Dict[str, Dict[str, float]]:
+        """Nested-dict snapshot of trust (npc1 -> npc2 -> trust_value)"""
+        return {
+            a: {b: float(self._trust[i, j]) for b, j in self._idx.items() if b != a}
+            for a, i in self._idx.items()
+        }
     
     def _same_faction(self, npc1: str, npc2: str) -> bool:
         """Check if two NPCs are in the same faction"""
-        for faction_members in self.factions.values():
-            if npc1 in faction_members and npc2 in faction_members:
-                return True
-        return False
+        faction = self._npc_faction.get(npc1)
+        return faction is not None and faction == self._npc_faction.get(npc2)
     
     def get_trust(self, from_npc: str, to_npc: str) -> float:
         """Get trust level from one NPC to another"""
-        return self.trust_matrix.get(from_npc, {}).get(to_npc, 0.5)
+        i = self._idx.get(from_npc)
+        j = self._idx.get(to_npc)
+        if i is None or j is None:
+            return 0.5
+        return float(self._trust[i, j])
     
     def modify_trust(self, from_npc: str, to_npc: str, delta: float):
         """Modify trust between NPCs"""
-        if from_npc in self.trust_matrix:
-            current = self.trust_matrix[from_npc].get(to_npc, 0.5)
-            new_trust = max(0.0, min(1.0, current + delta))
-            self.trust_matrix[from_npc][to_npc] = new_trust
-            
-            # Record in memory vault if significant change
-            if abs(delta) > 0.05:
-                npc = self.npcs.get(from_npc)
-                if npc:
-                    from database.memory_vault import Memory
-                    import uuid
-                    memory = Memory(
-                        id=f"trust_{uuid.uuid4().hex[:8]}",
-                        npc_id=from_npc,
-                        memory_type="social",
-                        content=f"Trust towards {to_npc} changed by {delta:+.2f} to {new_trust:.2f}",
-                        strength=0.7,
-                        timestamp=datetime.now().isoformat()
-                    )
-                    npc.memory_vault.save_memory(memory)
+        # Sub-epsilon deltas (common after MetaMind clamping) change nothing
+        if abs(delta) < 1e-4:
+            return
+        
+        i = self._idx.get(from_npc)
+        j = self._idx.get(to_npc)
+        if i is None or j is None:
+            return
+        
+        current = float(self._trust[i, j])
+        new_trust = max(0.0, min(1.0, current + delta))
+        self._trust[i, j] = new_trust
+        
+        # Record in memory vault only if significant change
+        if abs(delta) <= 0.05:
+            return
+        npc = self.npcs.get(from_npc)
+        if not npc:
+            return
+        
+        from database.memory_vault import Memory
+        import uuid
+        memory = Memory(
+            id=f"trust_{uuid.uuid4().hex[:8]}",
+            npc_id=from_npc,
+            memory_type="social",
+            content=f"Trust towards {to_npc} changed by {delta:+.2f} to {new_trust:.2f}",
+            strength=0.7,
+            timestamp=now_iso()
+        )
+        self._queue_memory(npc.memory_vault, memory)
+    
+    def _queue_memory(self, memory_vault, memory):
+        """Queue a memory for the background flusher (writes directly outside a loop)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            memory_vault.save_memory(memory)
+            return
+        
+        self._mem_queue.put_nowait((memory_vault, memory))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_memories())
+    
+    async def _flush_memories(self):
+        """Drain queued memories and save them in per-vault batches"""
+        while True:
+            batch = [await self._mem_queue.get()]
+            try:
+                await asyncio.sleep(0.05)  # Let a burst of trust changes accumulate
+            finally:
+                # Also runs when cancelled at shutdown, so the batch in hand is kept
+                self._drain_into(batch)
+                await self._save_batch(batch)
+    
+    def _drain_into(self, batch: List):
+        while not self._mem_queue.empty():
+            batch.append(self._mem_queue.get_nowait())
+    
+    async def _save_batch(self, batch: List):
+        by_vault: Dict = {}
+        for memory_vault, memory in batch:
+            by_vault.setdefault(memory_vault, []).append(memory)
+        
+        for memory_vault, memories in by_vault.items():
+            try:
+                await asyncio.to_thread(memory_vault.save_memories, memories)
+            except Exception as e:
+                print(f"⚠ Trust memory flush error: {e}")
+    
+    async def flush(self):
+        """Write every queued trust memory now"""
+        batch: List = []
+        self._drain_into(batch)
+        await self._save_batch(batch)
+    
+    async def stop(self):
+        """Orchestrator shutdown - stop background tasks and write out queued memories"""
+        for task in (self._vitals_task, self._flusher):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._vitals_task = None
+        self._flusher = None
+        await self.flush()
     
     async def npc_to_npc_interaction(self, from_npc_id: str, to_npc_id: str, 
                                      action: str) -> Dict:
@@ -118,7 +288,7 @@ class MultiNPCOrchestrator:
             from_npc=from_npc_id,
             to_npc=to_npc_id,
             action=action,
-            timestamp=datetime.now().isoformat(),
+            timestamp=now_iso(),
             trust_impact=response["cognitive_frame"].get("trust_mod", 0.0)
         )
         self.interaction_history.append(interaction)
@@ -130,6 +300,19 @@ class MultiNPCOrchestrator:
             "trust_level": self.get_trust(to_npc_id, from_npc_id)
         }
     
+    async def broadcast(self, from_npc_id: str, targets: List[str], action: str) -> List[Dict]:
+        """Run the same action from one NPC against several targets concurrently"""
+        async def one(to_npc_id: str) -> Dict:
+            async with self._llm_sem:
+                return await self.npc_to_npc_interaction(from_npc_id, to_npc_id, action)
+        
+        return await asyncio.gather(*[one(t) for t in targets], return_exceptions=True)
+    
+    def recent(self, n: int) -> List[NPCInteraction]:
+        """Most recent n interactions, oldest first"""
+        history = self.interaction_history
+        return list(islice(history, max(0, len(history) - n), None))
+    
     def get_faction_status(self) -> Dict:
         """Get status of all factions"""
         status = {}
@@ -146,16 +329,12 @@ class MultiNPCOrchestrator:
         if len(members) < 2:
             return 1.0
         
-        total_trust = 0.0
-        count = 0
-        
-        for npc1 in members:
-            for npc2 in members:
-                if npc1 != npc2:
-                    total_trust += self.get_trust(npc1, npc2)
-                    count += 1
+        idxs = np.fromiter((self._idx[m] for m in members), dtype=np.intp, count=len(members))
+        sub = self._trust[np.ix_(idxs, idxs)]
+        n = len(idxs)
         
-        return total_trust / count if count > 0 else 0.5
+        # Off-diagonal mean: every ordered pair of distinct members
+        return float((sub.sum() - np.trace(sub)) / (n * (n - 1)))
 
 # Global orchestrator instance
 orchestrator = MultiNPCOrchestrator()
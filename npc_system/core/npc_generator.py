@@ -2,12 +2,14 @@
 Dynamic NPC Generator - Create NPCs on the fly
 Supports random generation and custom personality definition
 """
-import random
+import threading
 import uuid
-import json
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, asdict
 
+import numpy as np
+import orjson
+
 @dataclass
 class NPCTemplate:
     """Base template for NPC generation"""
@@ -56,11 +58,127 @@ ROLE_TEMPLATES = {
     }
 }
 
+# Canonical trait order (columns of bulk personality matrices)
+TRAITS = ("curiosity", "empathy", "risk_tolerance", "aggression",
+          "discipline", "romanticism", "opportunism", "paranoia")
+
+_FIRST_NAMES = np.array([
+    "Marcus", "Elena", "Kai", "Zara", "Dmitri", "Aria", "Cole", "Nora",
+    "Jax", "Luna", "Rafe", "Iris", "Silas", "Maya", "Finn", "Sage"
+])
+
+_LAST_NAMES = np.array([
+    "Cross", "Stone", "Rivers", "Steel", "Ash", "North", "West", "Gray",
+    "Black", "White", "Green", "Vale", "Hunt", "Fox", "Wolf", "Hawk"
+])
+
+# Format templates, filled from one {name, role, location} mapping per NPC
+_BACKSTORY_TEMPLATES = np.array([
+    "{name} has been working as a {role} at {location} for several years. Trust is earned through actions, not words.",
+    "A survivor who found purpose as a {role}. {name} protects {location} with unwavering dedication.",
+    "Former wanderer turned {role}. {name} knows the harsh realities of the wasteland and guards {location} carefully.",
+    "{name} arrived at {location} seeking safety and stayed to serve as {role}. Loyalty is paramount.",
+    "Experienced {role} at {location}. {name} has seen both the best and worst of humanity."
+])
+
+# Initial memories: parallel type / content template columns
+_MEMORY_TYPES = ("belief", "episodic", "social")
+_MEMORY_TEMPLATES = (
+    "Trust must be earned through consistent actions.",
+    "First day at {location} - learned the importance of vigilance.",
+    "Working at {location} means dealing with all kinds of people."
+)
+
+@dataclass(frozen=True)
+class _RoleTemplate:
+    """Array (SoA) view of one ROLE_TEMPLATES entry, aligned to TRAITS"""
+    roles_arr: np.ndarray
+    locations_arr: np.ndarray
+    dialogue_arr: np.ndarray
+    trait_mins: np.ndarray
+    trait_maxs: np.ndarray
+    trait_mask: np.ndarray  # True where the role constrains the trait
+
+def _trait_bounds(base_traits: Dict):
+    """Per-trait (mins, maxs, mask) arrays for a base_traits mapping"""
+    mins = np.array([base_traits.get(t, (0.0, 0.0))[0] for t in TRAITS])
+    maxs = np.array([base_traits.get(t, (0.0, 0.0))[1] for t in TRAITS])
+    mask = np.array([t in base_traits for t in TRAITS])
+    return mins, maxs, mask
+
+def _build_fast_template(template: Dict) -> _RoleTemplate:
+    """Convert a ROLE_TEMPLATES entry to its array form"""
+    mins, maxs, mask = _trait_bounds(template.get("base_traits", {}))
+    return _RoleTemplate(
+        roles_arr=np.array(template["roles"]),
+        locations_arr=np.array(template["locations"]),
+        dialogue_arr=np.array(template["dialogue_styles"]),
+        trait_mins=mins,
+        trait_maxs=maxs,
+        trait_mask=mask
+    )
+
+# Read-only config, converted once at import
+_ROLE_TEMPLATES_FAST: Dict[str, _RoleTemplate] = {
+    role_type: _build_fast_template(template)
+    for role_type, template in ROLE_TEMPLATES.items()
+}
+
+def _build_persona_fn(role_type: str, base_traits: Dict) -> Callable:
+    """Generate a sampler for one role with its trait ranges inlined as literals"""
+    lines = []
+    for trait in TRAITS:
+        if trait in base_traits:
+            min_val, max_val = base_traits[trait]
+            draw = f"rng.uniform({min_val!r}, {max_val!r})"
+        else:
+            draw = "rng.triangular(0.2, 0.5, 0.8)"
+        lines.append(f"        {trait!r}: round({draw}, 2),")
+    
+    fn_name = f"_persona_{role_type}"
+    src = f"def {fn_name}(rng):\n    return {{\n" + "\n".join(lines) + "\n    }\n"
+    namespace: Dict[str, Any] = {}
+    exec(compile(src, f"<persona:{role_type}>", "exec"), namespace)
+    return namespace[fn_name]
+
+# Per-role personality samplers for single draws (no dict iteration or branching)
+_PERSONA_FNS: Dict[str, Callable] = {
+    role_type: _build_persona_fn(role_type, template.get("base_traits", {}))
+    for role_type, template in ROLE_TEMPLATES.items()
+}
+
+# Initial mood rules, checked in order: first trait above 0.7 decides the mood
+_MOOD_TRAIT_COLS = [TRAITS.index(t) for t in ("paranoia", "aggression", "empathy", "curiosity")]
+_MOOD_CHOICES = ["Paranoid", "Alert", "Calm", "Curious"]
+
+# Strength ranges of the belief / episodic / social initial memories
+_MEMORY_STRENGTH_LOW = np.array([0.7, 0.6, 0.5])
+_MEMORY_STRENGTH_HIGH = np.array([0.9, 0.8, 0.7])
+
+_tls = threading.local()
+
+def _thread_rng() -> np.random.Generator:
+    """This thread's long-lived random generator (no cross-thread state sharing)"""
+    rng = getattr(_tls, "rng", None)
+    if rng is None:
+        rng = np.random.Generator(np.random.PCG64DXSM())
+        _tls.rng = rng
+    return rng
+
 class NPCGenerator:
     """Generate NPCs with random or custom personalities"""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.generated_npcs = {}
+        # A seed pins this generator to its own reproducible stream
+        self._seeded_rng = None
+        if seed is not None:
+            self._seeded_rng = np.random.Generator(np.random.PCG64DXSM(seed))
+    
+    @property
+    def _rng(self) -> np.random.Generator:
+        """Seeded generator if any, otherwise the calling thread's generator"""
+        return self._seeded_rng or _thread_rng()
     
     def generate_random_npc(self, 
                            role_type: Optional[str] = None,
@@ -72,49 +190,106 @@ class NPCGenerator:
             role_type: Type of NPC (gatekeeper, guard, merchant, etc.)
             name: Optional custom name, otherwise auto-generated
         """
-        # Select role type
-        if role_type is None:
-            role_type = random.choice(list(ROLE_TEMPLATES.keys()))
+        names = [name] if name is not None else None
+        return self.generate_random_npcs(1, role_type=role_type, names=names)[0]
+    
+    def generate_random_npcs(self,
+                            n: int,
+                            role_type: Optional[str] = None,
+                            names: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Generate a batch of random NPCs, drawing all random values as arrays
         
-        if role_type not in ROLE_TEMPLATES:
-            role_type = "civilian"
+        Args:
+            n: Number of NPCs to generate
+            role_type: Type for every NPC, otherwise drawn per NPC
+            names: Optional custom names (one per NPC), otherwise auto-generated
+        """
+        rng = self._rng
         
-        template = ROLE_TEMPLATES[role_type]
+        # Select role types
+        if role_type is None:
+            role_keys = list(ROLE_TEMPLATES.keys())
+            role_types = [role_keys[i] for i in rng.integers(0, len(role_keys), size=n).tolist()]
+        else:
+            if role_type not in ROLE_TEMPLATES:
+                role_type = "civilian"
+            role_types = [role_type] * n
         
-        # Generate name if not provided
-        if name is None:
-            name = self._generate_name()
+        # Generate names if not provided
+        if names is None:
+            names = self._generate_names(n)
         
-        # Select from template options
-        role = random.choice(template["roles"])
-        location = random.choice(template["locations"])
-        dialogue_style = random.choice(template["dialogue_styles"])
+        # Role-independent columns
+        vitals = rng.uniform(0.1, 0.4, size=(n, 2)).tolist()
+        backstory_idx = rng.integers(0, _BACKSTORY_TEMPLATES.size, size=n).tolist()
+        strengths = self._bulk_memory_strengths(n).tolist()
         
-        # Generate personality traits
-        personality = self._generate_personality(template.get("base_traits", {}))
+        # Template options and trait ranges differ per role, so draw per role group
+        roles: List[str] = [None] * n
+        locations: List[str] = [None] * n
+        dialogue_styles: List[str] = [None] * n
+        personalities: List[Dict[str, float]] = [None] * n
+        moods: List[str] = [None] * n
+        role_arr = np.array(role_types)
         
-        # Generate backstory
-        backstory = self._generate_backstory(name, role, location)
+        for group_type in dict.fromkeys(role_types):
+            fast = _ROLE_TEMPLATES_FAST[group_type]
+            members = np.flatnonzero(role_arr == group_type)
+            k = members.size
+            
+            if k == 1:
+                # Single NPC (e.g. generate_random_npc): the generated sampler
+                # beats building a one-row matrix
+                group_personalities = [_PERSONA_FNS[group_type](rng)]
+                group_moods = [self._select_initial_mood(group_personalities[0])]
+            else:
+                traits = self._bulk_personality(k, fast.trait_mins, fast.trait_maxs, fast.trait_mask)
+                group_personalities = [dict(zip(TRAITS, row)) for row in traits.tolist()]
+                group_moods = self._select_initial_moods(traits)
+            
+            picks = zip(
+                members.tolist(),
+                fast.roles_arr[rng.integers(0, fast.roles_arr.size, size=k)].tolist(),
+                fast.locations_arr[rng.integers(0, fast.locations_arr.size, size=k)].tolist(),
+                fast.dialogue_arr[rng.integers(0, fast.dialogue_arr.size, size=k)].tolist(),
+                group_personalities,
+                group_moods
+            )
+            for i, role, location, dialogue_style, personality, mood in picks:
+                roles[i] = role
+                locations[i] = location
+                dialogue_styles[i] = dialogue_style
+                personalities[i] = personality
+                moods[i] = mood
         
-        # Create NPC definition
-        npc_def = {
-            "npc_id": name,
-            "role": role,
-            "location": location,
-            "personality": personality,
-            "initial_mood": self._select_initial_mood(personality),
-            "initial_vitals": {
-                "hunger": random.uniform(0.1, 0.4),
-                "fatigue": random.uniform(0.1, 0.4)
-            },
-            "backstory": backstory,
-            "initial_memories": self._generate_initial_memories(name, role, location),
-            "current_goal": self._select_goal(role_type),
-            "dialogue_style": dialogue_style
-        }
+        npc_defs = []
+        for i in range(n):
+            name, role, location = names[i], roles[i], locations[i]
+            fields = {"name": name, "role": role, "location": location}
+            personality = personalities[i]
+            
+            # Create NPC definition
+            npc_def = {
+                "npc_id": name,
+                "role": role,
+                "location": location,
+                "personality": personality,
+                "initial_mood": moods[i],
+                "initial_vitals": {
+                    "hunger": vitals[i][0],
+                    "fatigue": vitals[i][1]
+                },
+                "backstory": _BACKSTORY_TEMPLATES[backstory_idx[i]].format_map(fields),
+                "initial_memories": self._fill_initial_memories(fields, strengths[i]),
+                "current_goal": self._select_goal(role_types[i]),
+                "dialogue_style": dialogue_styles[i]
+            }
+            
+            self.generated_npcs[name] = npc_def
+            npc_defs.append(npc_def)
         
-        self.generated_npcs[name] = npc_def
-        return npc_def
+        return npc_defs
     
     def create_custom_npc(self,
                          name: str,
@@ -136,26 +311,14 @@ class NPCGenerator:
             dialogue_style: How the NPC speaks
             faction: Which faction the NPC belongs to
         """
-        # Validate personality traits
-        valid_traits = ["curiosity", "empathy", "risk_tolerance", "aggression", 
-                       "discipline", "romanticism", "opportunism", "paranoia"]
-        
         # Ensure all traits exist, fill missing with defaults
-        full_personality = {
-            "curiosity": 0.5,
-            "empathy": 0.5,
-            "risk_tolerance": 0.5,
-            "aggression": 0.5,
-            "discipline": 0.5,
-            "romanticism": 0.5,
-            "opportunism": 0.5,
-            "paranoia": 0.5
-        }
+        full_personality = dict.fromkeys(TRAITS, 0.5)
         full_personality.update(personality)
         
         # Clamp values
-        for trait in full_personality:
-            full_personality[trait] = max(0.0, min(1.0, full_personality[trait]))
+        values = np.fromiter(full_personality.values(), dtype=np.float64, count=len(full_personality))
+        np.clip(values, 0.0, 1.0, out=values)
+        full_personality = dict(zip(full_personality, values.tolist()))
         
         npc_def = {
             "npc_id": name,
@@ -186,87 +349,75 @@ class NPCGenerator:
     
     def _generate_personality(self, base_traits: Dict) -> Dict[str, float]:
         """Generate random personality with optional base traits"""
-        personality = {}
-        
-        traits = ["curiosity", "empathy", "risk_tolerance", "aggression",
-                 "discipline", "romanticism", "opportunism", "paranoia"]
-        
-        for trait in traits:
-            if trait in base_traits:
-                # Use constrained range for role-appropriate traits
-                min_val, max_val = base_traits[trait]
-                personality[trait] = round(random.uniform(min_val, max_val), 2)
-            else:
-                # Random value with slight bias towards middle
-                personality[trait] = round(random.triangular(0.2, 0.8, 0.5), 2)
-        
-        return personality
+        traits = self._bulk_personality(1, *_trait_bounds(base_traits))
+        return dict(zip(TRAITS, traits[0].tolist()))
+    
+    def _bulk_personality(self, n: int, mins: np.ndarray, maxs: np.ndarray,
+                          mask: np.ndarray) -> np.ndarray:
+        """Generate an (n, len(TRAITS)) personality matrix for one role"""
+        shape = (n, len(TRAITS))
+        # Constrained range for role-appropriate traits, otherwise a random
+        # value with slight bias towards middle
+        traits = np.where(
+            mask,
+            self._rng.uniform(mins, maxs, size=shape),
+            self._rng.triangular(0.2, 0.5, 0.8, size=shape)
+        )
+        return np.round(traits, 2)
     
     def _generate_name(self) -> str:
         """Generate a random NPC name"""
-        first_names = [
-            "Marcus", "Elena", "Kai", "Zara", "Dmitri", "Aria", "Cole", "Nora",
-            "Jax", "Luna", "Rafe", "Iris", "Silas", "Maya", "Finn", "Sage"
-        ]
-        
-        last_names = [
-            "Cross", "Stone", "Rivers", "Steel", "Ash", "North", "West", "Gray",
-            "Black", "White", "Green", "Vale", "Hunt", "Fox", "Wolf", "Hawk"
-        ]
+        return self._generate_names(1)[0]
+    
+    def _generate_names(self, n: int) -> List[str]:
+        """Generate n random NPC names"""
+        rng = self._rng
+        first = _FIRST_NAMES[rng.integers(0, _FIRST_NAMES.size, size=n)]
+        last = _LAST_NAMES[rng.integers(0, _LAST_NAMES.size, size=n)]
         
         # 60% chance of full name, 40% single name
-        if random.random() < 0.6:
-            return f"{random.choice(first_names)}_{random.choice(last_names)}"
-        else:
-            return random.choice(first_names)
+        full_name = rng.random(n) < 0.6
+        return np.where(full_name, np.char.add(np.char.add(first, "_"), last), first).tolist()
     
     def _generate_backstory(self, name: str, role: str, location: str) -> str:
         """Generate a random backstory"""
-        templates = [
-            f"{name} has been working as a {role} at {location} for several years. Trust is earned through actions, not words.",
-            f"A survivor who found purpose as a {role}. {name} protects {location} with unwavering dedication.",
-            f"Former wanderer turned {role}. {name} knows the harsh realities of the wasteland and guards {location} carefully.",
-            f"{name} arrived at {location} seeking safety and stayed to serve as {role}. Loyalty is paramount.",
-            f"Experienced {role} at {location}. {name} has seen both the best and worst of humanity."
-        ]
-        return random.choice(templates)
+        template = _BACKSTORY_TEMPLATES[self._rng.integers(0, _BACKSTORY_TEMPLATES.size)]
+        return template.format_map({"name": name, "role": role, "location": location})
+    
+    def _bulk_memory_strengths(self, n: int) -> np.ndarray:
+        """Draw (n, 3) strengths for the belief / episodic / social memories"""
+        return np.round(
+            self._rng.uniform(_MEMORY_STRENGTH_LOW, _MEMORY_STRENGTH_HIGH, size=(n, 3)), 2
+        )
     
     def _generate_initial_memories(self, name: str, role: str, location: str) -> List[Dict]:
         """Generate initial memories for NPC"""
-        memories = [
-            {
-                "id": f"mem_{name}_001",
-                "memory_type": "belief",
-                "content": f"Trust must be earned through consistent actions.",
-                "strength": round(random.uniform(0.7, 0.9), 2)
-            },
-            {
-                "id": f"mem_{name}_002",
-                "memory_type": "episodic",
-                "content": f"First day at {location} - learned the importance of vigilance.",
-                "strength": round(random.uniform(0.6, 0.8), 2)
-            },
+        fields = {"name": name, "role": role, "location": location}
+        return self._fill_initial_memories(fields, self._bulk_memory_strengths(1)[0].tolist())
+    
+    def _fill_initial_memories(self, fields: Dict[str, str], strengths: List[float]) -> List[Dict]:
+        """Build the initial memory dicts from template fields and drawn strengths"""
+        name = fields["name"]
+        return [
             {
-                "id": f"mem_{name}_003",
-                "memory_type": "social",
-                "content": f"Working at {location} means dealing with all kinds of people.",
-                "strength": round(random.uniform(0.5, 0.7), 2)
+                "id": f"mem_{name}_{n:03d}",
+                "memory_type": memory_type,
+                "content": template.format_map(fields),
+                "strength": strength
             }
+            for n, memory_type, template, strength
+            in zip(range(1, 4), _MEMORY_TYPES, _MEMORY_TEMPLATES, strengths)
         ]
-        return memories
     
     def _select_initial_mood(self, personality: Dict) -> str:
         """Select initial mood based on personality"""
-        if personality.get("paranoia", 0.5) > 0.7:
-            return "Paranoid"
-        elif personality.get("aggression", 0.5) > 0.7:
-            return "Alert"
-        elif personality.get("empathy", 0.5) > 0.7:
-            return "Calm"
-        elif personality.get("curiosity", 0.5) > 0.7:
-            return "Curious"
-        else:
-            return "Neutral"
+        row = np.array([[personality.get(t, 0.5) for t in TRAITS]])
+        return self._select_initial_moods(row)[0]
+    
+    def _select_initial_moods(self, traits: np.ndarray) -> List[str]:
+        """Select initial moods for an (n, len(TRAITS)) personality matrix"""
+        above = traits[:, _MOOD_TRAIT_COLS] > 0.7
+        return np.select(above.T, _MOOD_CHOICES, default="Neutral").tolist()
     
     def _select_goal(self, role_type: str) -> str:
         """Select appropriate goal based on role"""
@@ -288,8 +439,8 @@ class NPCGenerator:
         npc_def = self.generated_npcs[npc_id]
         filename = f"{directory}/{npc_id.lower()}_v1.json"
         
-        with open(filename, 'w') as f:
-            json.dump(npc_def, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(npc_def, option=orjson.OPT_INDENT_2))
         
         return filename
     
@@ -1,26 +1,43 @@
 """Complete NPC System - Orchestrates all subsystems"""
 import asyncio
-import uuid
+import copy
+import os
+import random
+import types
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict
-import json
+
+import orjson
 
 from core.brain import CognitiveBrain
-from core.limbic import LimbicSystem
+from core.limbic import LimbicSystem, rounded_summary
 from core.meta_mind import MetaMind
 from database.memory_vault import MemoryVault, Memory
 
 
+@lru_cache(maxsize=256)
+def _load_persona_cached(persona_path: str, mtime: float) -> Dict:
+    """Parse a persona file (mtime is part of the key, so edits are reloaded)
+    
+    The cached dict is shared - callers must deepcopy it before use.
+    """
+    with open(persona_path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
 class NPCSystem:
     """Complete NPC with all cognitive subsystems"""
     
     def __init__(self, persona_path: str):
-        # Load persona
-        with open(persona_path, 'r') as f:
-            self.persona = json.load(f)
+        # Load persona (parsed once per file version, copied per instance)
+        mtime = os.path.getmtime(persona_path)
+        self.persona = copy.deepcopy(_load_persona_cached(persona_path, mtime))
         
         self.npc_id = self.persona["npc_id"]
         self.personality = self.persona["personality"]
+        # Read-only live view handed out in responses; dict() it for a frozen snapshot
+        self._personality_view = types.MappingProxyType(self.personality)
         
         # Initialize subsystems
         self.memory_vault = MemoryVault()
@@ -47,17 +64,22 @@ class NPCSystem:
     
     def _load_initial_memories(self):
         """Load initial memories from persona"""
-        for mem_data in self.persona.get("initial_memories", []):
-            memory = Memory(
+        initial_memories = self.persona.get("initial_memories", [])
+        timestamp = datetime.now().isoformat()
+        
+        # One executemany/commit for the whole persona instead of one per memory
+        self.memory_vault.save_memories([
+            Memory(
                 id=mem_data["id"],
                 npc_id=self.npc_id,
                 memory_type=mem_data["memory_type"],
                 content=mem_data["content"],
                 strength=mem_data["strength"],
-                timestamp=datetime.now().isoformat()
+                timestamp=timestamp
             )
-            self.memory_vault.save_memory(memory)
-        print(f"✓ Loaded {len(self.persona.get('initial_memories', []))} initial memories")
+            for mem_data in initial_memories
+        ])
+        print(f"✓ Loaded {len(initial_memories)} initial memories")
     
     async def start_autonomous_systems(self):
         """Start Thread B: Autonomous vitals & reflection"""
@@ -74,6 +96,13 @@ class NPCSystem:
         print(f"\n[Player Action] {action}")
         print(f"[Think Time] {self.limbic.get_think_time():.1f}s")
         
+        # Keyword checks shared by steps 4 and 6 (one casefold, each scan once)
+        action_cf = action.casefold()
+        mentions_threat = "threat" in action_cf
+        mentions_help = "help" in action_cf
+        is_threat = mentions_threat or "weapon" in action_cf
+        is_help = mentions_help or "assist" in action_cf
+        
         # Step 1: Cognitive processing (Brain)
         cognitive_frame = await self.brain.process_perception(action)
         
@@ -87,33 +116,33 @@ class NPCSystem:
         )
         
         # Step 4: Update emotional state based on action
-        if "threat" in action.lower() or "weapon" in action.lower():
+        if is_threat:
             self.limbic.emotional_state.update_from_event("threat", 0.3)
-        elif "help" in action.lower() or "assist" in action.lower():
+        elif is_help:
             self.limbic.emotional_state.update_from_event("positive", 0.2)
         
         # Step 5: Save memory
         memory = Memory(
-            id=f"mem_{uuid.uuid4().hex[:8]}",
+            id=f"mem_{random.randbytes(4).hex()}",
             npc_id=self.npc_id,
             memory_type="episodic",
             content=f"Player action: {action}",
             strength=0.6,
             timestamp=datetime.now().isoformat()
         )
-        self.memory_vault.save_memory(memory)
+        self.memory_vault.save_memory_async(memory)
         
         # Step 6: Trait drift (if significant event)
         if resolved_frame.get("urgency", 0) > 0.7:
-            if "threat" in action.lower():
+            if mentions_threat:
                 self.meta_mind.apply_trait_drift("paranoia", 0.1, self.memory_vault)
-            elif "help" in action.lower():
+            elif mentions_help:
                 self.meta_mind.apply_trait_drift("empathy", 0.05, self.memory_vault)
         
         return {
             "cognitive_frame": resolved_frame,
-            "limbic_state": limbic_state,
-            "personality_snapshot": self.personality.copy()
+            "limbic_state": rounded_summary(limbic_state),
+            "personality_snapshot": self._personality_view
         }
     
     def stop(self):
@@ -121,6 +150,7 @@ class NPCSystem:
         self.limbic.stop()
         if self.autonomous_task:
             self.autonomous_task.cancel()
+        self.memory_vault.flush()
         print("\n✓ NPC systems stopped")
     
     def display_response(self, response: Dict):
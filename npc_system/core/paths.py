@@ -3,8 +3,10 @@ Path Configuration for NPC System
 Handles database paths for both local development and container deployment
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 
+@lru_cache(maxsize=1)
 def get_base_path() -> Path:
     """Get the base path for the NPC system"""
     # Check if we're in a container (Emergent/Docker)
@@ -14,8 +16,9 @@ def get_base_path() -> Path:
     # Local development - use the directory where this file is located
     return Path(__file__).parent.parent
 
+@lru_cache(maxsize=1)
 def get_database_path() -> Path:
-    """Get the database directory path"""
+    """Get the database directory path (created on first call)"""
     db_path = get_base_path() / "database"
     db_path.mkdir(parents=True, exist_ok=True)
     return db_path
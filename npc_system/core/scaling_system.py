@@ -2,17 +2,30 @@
 Phase 5: Global Scaling - Performance Optimization System
 Handles 100+ NPCs efficiently with caching, batching, and connection pooling
 """
+import queue
 import sqlite3
 import threading
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Deque, Dict, Iterable, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from collections import OrderedDict
+from pathlib import Path
+from collections import deque
+from itertools import groupby
+from operator import itemgetter
 import asyncio
+import heapq
 import random
 
+import numpy as np
+
+# Optional JIT for per-NPC numeric kernels (falls back to plain NumPy)
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Import path configuration for database locations
 try:
     from core.paths import MEMORY_VAULT_DB
@@ -27,70 +40,92 @@ except ImportError:
 # ============================================================================
 
 class ConnectionPool:
-    """Thread-safe connection pool for SQLite"""
+    """Thread-safe connection pool for SQLite
+    
+    Idle connections sit in a lock-free SimpleQueue; once a thread takes
+    one it keeps it (thread-local) for all later checkouts.
+    """
     
     def __init__(self, db_path: str, pool_size: int = 10):
         self.db_path = db_path
         self.pool_size = pool_size
-        self._pool: List[sqlite3.Connection] = []
-        self._lock = threading.Lock()
-        self._in_use: Dict[int, sqlite3.Connection] = {}
+        self._pool: queue.SimpleQueue = queue.SimpleQueue()
+        self._tls = threading.local()
+        self._all: List[sqlite3.Connection] = []  # every connection, for close_all
+        self._all_lock = threading.Lock()  # only taken when creating/closing
+        self._generation = 0  # bumped by close_all to retire thread-local handles
         
         # Pre-create connections
         for _ in range(pool_size):
-            conn = self._create_connection()
-            self._pool.append(conn)
+            self._pool.put(self._create_connection())
         
         print(f"✓ Connection pool initialized with {pool_size} connections")
     
     def _create_connection(self) -> sqlite3.Connection:
         """Create optimized SQLite connection"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Autocommit mode: writers open explicit BEGIN IMMEDIATE transactions
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         conn.execute("PRAGMA journal_mode=WAL")  # Write-Ahead Logging for concurrency
         conn.execute("PRAGMA synchronous=NORMAL")  # Faster writes
-        conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
+        conn.execute("PRAGMA cache_size=-65536")  # 64MiB page cache
         conn.execute("PRAGMA temp_store=MEMORY")  # Temp tables in memory
+        conn.execute("PRAGMA mmap_size=268435456")  # Read pages via 256MiB memory map
+        conn.execute("PRAGMA wal_autocheckpoint=1000")  # Checkpoint every ~1000 WAL pages
+        conn.row_factory = sqlite3.Row
+        with self._all_lock:
+            self._all.append(conn)
+        return conn
+    
+    def _create_ro_connection(self) -> sqlite3.Connection:
+        """Create a read-only connection (it can never take SQLite's write lock)"""
+        conn = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True,
+                               check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
         conn.row_factory = sqlite3.Row
+        with self._all_lock:
+            self._all.append(conn)
         return conn
     
     @contextmanager
-    def get_connection(self):
-        """Get a connection from the pool"""
-        conn = None
-        thread_id = threading.get_ident()
+    def get_ro_connection(self):
+        """Get this thread's read-only connection (opened on first use)"""
+        conn = getattr(self._tls, "ro_conn", None)
+        if conn is None or self._tls.ro_generation != self._generation:
+            conn = self._tls.ro_conn = self._create_ro_connection()
+            self._tls.ro_generation = self._generation
         
-        with self._lock:
-            # Check if this thread already has a connection
-            if thread_id in self._in_use:
-                conn = self._in_use[thread_id]
-            elif self._pool:
-                conn = self._pool.pop()
-                self._in_use[thread_id] = conn
-            else:
+        yield conn
+    
+    @contextmanager
+    def get_connection(self):
+        """Get this thread's connection (taken from the pool on first use)"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None or self._tls.generation != self._generation:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
                 # Pool exhausted, create new connection
                 conn = self._create_connection()
-                self._in_use[thread_id] = conn
+            self._tls.conn = conn
+            self._tls.generation = self._generation
         
-        try:
-            yield conn
-        finally:
-            with self._lock:
-                if thread_id in self._in_use:
-                    returned_conn = self._in_use.pop(thread_id)
-                    if len(self._pool) < self.pool_size:
-                        self._pool.append(returned_conn)
-                    else:
-                        returned_conn.close()
+        yield conn
     
     def close_all(self):
         """Close all connections"""
-        with self._lock:
-            for conn in self._pool:
-                conn.close()
-            for conn in self._in_use.values():
+        with self._all_lock:
+            self._generation += 1
+            while True:
+                try:
+                    self._pool.get_nowait()
+                except queue.Empty:
+                    break
+            for conn in self._all:
                 conn.close()
-            self._pool.clear()
-            self._in_use.clear()
+            self._all.clear()
 
 
 # ============================================================================
@@ -98,80 +133,149 @@ class ConnectionPool:
 # ============================================================================
 
 class TTLCache:
-    """Thread-safe LRU cache with time-to-live expiration"""
+    """Thread-safe LRU cache with time-to-live expiration
+    
+    Keys are spread over independent shards, each with its own lock, LRU
+    order and size budget, so concurrent lookups rarely contend. Entries
+    are stored as (value, expiry); a per-shard heap of expiries lets writes
+    reclaim a few expired entries without scanning. LRU order is the plain
+    dict insertion order, refreshed on every 8th hit (or every hit when the
+    shard is nearly full), so most hits don't touch the ordering at all.
+    """
+    
+    SHARDS = 16  # must be a power of two
+    EXPIRE_PER_SET = 4  # max expired entries reclaimed per set()
+    PROMOTE_EVERY = 8  # must be a power of two
     
     def __init__(self, max_size: int = 1000, ttl_seconds: int = 300):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._cache: OrderedDict = OrderedDict()
-        self._timestamps: Dict[str, float] = {}
-        self._lock = threading.Lock()
-        self._hits = 0
-        self._misses = 0
+        self._ttl_ns = int(ttl_seconds * 1_000_000_000)
+        self._shard_max = max(1, -(-max_size // self.SHARDS))
+        self._promote_at = int(self._shard_max * 0.9)
+        self._shards: List[Dict[str, Tuple[Any, float]]] = [{} for _ in range(self.SHARDS)]
+        self._heaps: List[List[Tuple[float, str]]] = [[] for _ in range(self.SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.SHARDS)]
+        self._hits = [0] * self.SHARDS
+        self._misses = [0] * self.SHARDS
+        # tag -> keys set under it, so invalidate_tag touches only those keys
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._tag_lock = threading.Lock()
+    
+    def _shard(self, key: str) -> int:
+        """Shard index for a key"""
+        return hash(key) & (self.SHARDS - 1)
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        with self._lock:
-            if key in self._cache:
+        s = self._shard(key)
+        cache = self._shards[s]
+        with self._locks[s]:
+            entry = cache.get(key)
+            if entry is not None:
                 # Check TTL
-                if time.time() - self._timestamps[key] < self.ttl_seconds:
-                    # Move to end (most recently used)
-                    self._cache.move_to_end(key)
-                    self._hits += 1
-                    return self._cache[key]
+                if entry[1] > time.monotonic_ns():
+                    self._hits[s] += 1
+                    # Approximate LRU: re-insert at the end (most recently used)
+                    if (self._hits[s] & (self.PROMOTE_EVERY - 1)) == 0 or len(cache) > self._promote_at:
+                        del cache[key]
+                        cache[key] = entry
+                    return entry[0]
                 else:
                     # Expired
-                    del self._cache[key]
-                    del self._timestamps[key]
+                    del cache[key]
             
-            self._misses += 1
+            self._misses[s] += 1
             return None
     
-    def set(self, key: str, value: Any):
-        """Set value in cache"""
-        with self._lock:
-            if key in self._cache:
-                self._cache.move_to_end(key)
+    def set(self, key: str, value: Any, tag: Optional[str] = None):
+        """Set value in cache (optionally under a tag for invalidate_tag)"""
+        if tag is not None:
+            with self._tag_lock:
+                keys = self._tag_index.get(tag)
+                if keys is None:
+                    keys = self._tag_index[tag] = set()
+                keys.add(key)
+        
+        s = self._shard(key)
+        cache = self._shards[s]
+        heap = self._heaps[s]
+        now = time.monotonic_ns()
+        expiry = now + self._ttl_ns
+        
+        with self._locks[s]:
+            if key in cache:
+                del cache[key]  # re-inserted below as most recently used
             else:
-                if len(self._cache) >= self.max_size:
+                if len(cache) >= self._shard_max:
                     # Remove oldest item
-                    oldest_key = next(iter(self._cache))
-                    del self._cache[oldest_key]
-                    del self._timestamps[oldest_key]
+                    oldest_key = next(iter(cache))
+                    del cache[oldest_key]
             
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
+            cache[key] = (value, expiry)
+            heapq.heappush(heap, (expiry, key))
+            
+            # Reclaim a few expired entries; skip heap records left behind by
+            # re-sets (their expiry no longer matches the stored one)
+            for _ in range(self.EXPIRE_PER_SET):
+                if not heap or heap[0][0] > now:
+                    break
+                old_expiry, old_key = heapq.heappop(heap)
+                entry = cache.get(old_key)
+                if entry is not None and entry[1] == old_expiry:
+                    del cache[old_key]
     
     def invalidate(self, key: str):
         """Remove key from cache"""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
+        s = self._shard(key)
+        with self._locks[s]:
+            self._shards[s].pop(key, None)
+    
+    def invalidate_tag(self, tag: str):
+        """Remove every key set under a tag"""
+        with self._tag_lock:
+            keys = self._tag_index.pop(tag, None)
+        if keys:
+            for key in keys:
+                self.invalidate(key)
+    
+    def invalidate_tags(self, tags: Iterable[str]):
+        """Remove every key set under any of the given tags"""
+        with self._tag_lock:
+            key_sets = [self._tag_index.pop(tag, None) for tag in tags]
+        for keys in key_sets:
+            if keys:
+                for key in keys:
+                    self.invalidate(key)
     
     def invalidate_prefix(self, prefix: str):
         """Remove all keys with given prefix"""
-        with self._lock:
-            keys_to_remove = [k for k in self._cache.keys() if k.startswith(prefix)]
-            for key in keys_to_remove:
-                del self._cache[key]
-                del self._timestamps[key]
+        for cache, lock in zip(self._shards, self._locks):
+            with lock:
+                keys_to_remove = [k for k in cache.keys() if k.startswith(prefix)]
+                for key in keys_to_remove:
+                    del cache[key]
     
     def clear(self):
         """Clear entire cache"""
-        with self._lock:
-            self._cache.clear()
-            self._timestamps.clear()
+        for cache, heap, lock in zip(self._shards, self._heaps, self._locks):
+            with lock:
+                cache.clear()
+                heap.clear()
+        with self._tag_lock:
+            self._tag_index.clear()
     
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total = self._hits + self._misses
-        hit_rate = (self._hits / total * 100) if total > 0 else 0
+        hits = sum(self._hits)
+        misses = sum(self._misses)
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total > 0 else 0
         return {
-            "size": len(self._cache),
+            "size": sum(len(cache) for cache in self._shards),
             "max_size": self.max_size,
-            "hits": self._hits,
-            "misses": self._misses,
+            "hits": hits,
+            "misses": misses,
             "hit_rate": f"{hit_rate:.1f}%"
         }
 
@@ -180,6 +284,32 @@ class TTLCache:
 # Tiered NPC Update System
 # ============================================================================
 
+def _classify_tiers_numpy(dt: np.ndarray, edges: np.ndarray, freq_by_code: np.ndarray,
+                          out_freq: np.ndarray, out_tier: np.ndarray):
+    """Tier code = number of threshold edges already passed"""
+    codes = np.searchsorted(edges, dt, side="right")
+    out_tier[:] = codes
+    out_freq[:] = freq_by_code[codes]
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _classify_tiers(dt, edges, freq_by_code, out_freq, out_tier):
+        """Tier code = number of threshold edges already passed"""
+        for i in prange(dt.size):
+            code = 0
+            while code < edges.size and dt[i] >= edges[code]:
+                code += 1
+            out_tier[i] = code
+            out_freq[i] = freq_by_code[code]
+    
+    # Compile at import so the first world tick isn't penalized
+    _classify_tiers(np.zeros(1, dtype=np.int64), np.zeros(3, dtype=np.int64), np.zeros(4, dtype=np.int32),
+                    np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.int8))
+else:
+    _classify_tiers = _classify_tiers_numpy
+
+
 @dataclass
 class NPCActivityState:
     """Tracks NPC activity for tiered updates"""
@@ -200,6 +330,9 @@ class TieredUpdateSystem:
     - NEARBY: Player was here recently (update every 5 ticks)
     - IDLE: No recent activity (update every 20 ticks)
     - DORMANT: Long inactive (update every 100 ticks)
+    
+    NPC state is kept as parallel NumPy arrays (one slot per NPC) so tier
+    updates and tick selection are single vectorized operations.
     """
     
     TIER_ACTIVE = "active"
@@ -222,89 +355,162 @@ class TieredUpdateSystem:
         TIER_IDLE: 3600,      # Idle for 1 hour
     }
     
-    def __init__(self):
-        self._npc_states: Dict[str, NPCActivityState] = {}
+    # Array encodings: tier code i <-> TIERS[i]
+    TIERS = (TIER_ACTIVE, TIER_NEARBY, TIER_IDLE, TIER_DORMANT)
+    _TIER_CODES = dict(zip(TIERS, range(len(TIERS))))
+    _FREQ_BY_CODE = np.array(list(map(TIER_FREQUENCIES.get, TIERS)), dtype=np.int32)
+    _THRESHOLD_EDGES_NS = np.array(list(map(TIER_THRESHOLDS.get, TIERS[:3])), dtype=np.int64) * 1_000_000_000
+    
+    # last_interaction of an NPC never interacted with: always dormant, no overflow
+    _NEVER = -(1 << 62)
+    
+    def __init__(self, capacity: int = 64):
         self._lock = threading.Lock()
         self._current_tick = 0
-        self._zones: Dict[str, List[str]] = {}  # zone -> list of npc_ids
+        self._zones: Dict[str, Tuple[str, ...]] = {}  # zone -> npc_ids (immutable, rebuilt on change)
+        
+        # Structure-of-arrays NPC state, valid in [:self._count]
+        self._id_to_idx: Dict[str, int] = {}
+        self._count = 0
+        self._ids = np.empty(capacity, dtype=object)
+        self._npc_zone: List[str] = []
+        # Times are time.monotonic_ns() values
+        self._last_interaction_ns = np.zeros(capacity, dtype=np.int64)
+        self._last_update_ns = np.zeros(capacity, dtype=np.int64)
+        self._interaction_count = np.zeros(capacity, dtype=np.int32)
+        self._tier = np.zeros(capacity, dtype=np.int8)
+        self._tier_freq = np.zeros(capacity, dtype=np.int32)
+    
+    def _grow(self):
+        """Double array capacity (caller holds the lock)"""
+        cap = self._ids.size * 2
+        for name in ("_ids", "_last_interaction_ns", "_last_update_ns",
+                     "_interaction_count", "_tier", "_tier_freq"):
+            old = getattr(self, name)
+            grown = np.empty(cap, dtype=old.dtype)  # new slots are set on register
+            grown[:old.size] = old
+            setattr(self, name, grown)
     
-    def register_npc(self, npc_id: str, zone: str = "default"):
-        """Register an NPC in the system"""
+    def register_npc(self, npc_id: str, zone: str = "default") -> int:
+        """Register an NPC in the system, returning its integer handle"""
         with self._lock:
-            self._npc_states[npc_id] = NPCActivityState(
-                npc_id=npc_id,
-                last_update=time.time(),
-                zone=zone,
-                tier=self.TIER_IDLE
-            )
+            i = self._id_to_idx.get(npc_id)
+            if i is None:
+                i = self._count
+                if i == self._ids.size:
+                    self._grow()
+                self._count += 1
+                self._id_to_idx[npc_id] = i
+                self._ids[i] = npc_id
+                self._npc_zone.append(zone)
+            else:
+                self._npc_zone[i] = zone
             
-            if zone not in self._zones:
-                self._zones[zone] = []
-            if npc_id not in self._zones[zone]:
-                self._zones[zone].append(npc_id)
+            idle = self._TIER_CODES[self.TIER_IDLE]
+            self._last_interaction_ns[i] = self._NEVER
+            self._last_update_ns[i] = time.monotonic_ns()
+            self._interaction_count[i] = 0
+            self._tier[i] = idle
+            self._tier_freq[i] = self._FREQ_BY_CODE[idle]
+            
+            members = self._zones.get(zone, ())
+            if npc_id not in members:
+                self._zones[zone] = members + (npc_id,)
+            
+            return i
+    
+    def get_handle(self, npc_id: str) -> Optional[int]:
+        """Integer handle of a registered NPC (stable for the NPC's lifetime)"""
+        return self._id_to_idx.get(npc_id)
     
     def record_interaction(self, npc_id: str):
         """Record that an NPC was interacted with"""
+        i = self._id_to_idx.get(npc_id)
+        if i is not None:
+            self.record_interaction_h(i)
+    
+    def record_interaction_h(self, handle: int):
+        """Record an interaction by handle (no string hashing)"""
         with self._lock:
-            if npc_id in self._npc_states:
-                state = self._npc_states[npc_id]
-                state.last_interaction = time.time()
-                state.interaction_count_recent += 1
-                state.tier = self.TIER_ACTIVE
+            self._last_interaction_ns[handle] = time.monotonic_ns()
+            self._interaction_count[handle] += 1
+            self._tier[handle] = self._TIER_CODES[self.TIER_ACTIVE]
+            self._tier_freq[handle] = self._FREQ_BY_CODE[self._tier[handle]]
+    
+    def record_interactions_batch(self, npc_ids: Iterable[str]):
+        """Record one interaction per listed NPC (repeats count) in a single locked pass"""
+        handles = np.fromiter(
+            (i for i in map(self._id_to_idx.get, npc_ids) if i is not None), dtype=np.intp)
+        if handles.size == 0:
+            return
+        active = self._TIER_CODES[self.TIER_ACTIVE]
+        
+        with self._lock:
+            self._last_interaction_ns[handles] = time.monotonic_ns()
+            np.add.at(self._interaction_count, handles, 1)
+            self._tier[handles] = active
+            self._tier_freq[handles] = self._FREQ_BY_CODE[active]
     
     def update_tiers(self):
         """Update all NPC tiers based on activity"""
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
         
         with self._lock:
-            for npc_id, state in self._npc_states.items():
-                time_since_interaction = current_time - state.last_interaction
-                
-                if time_since_interaction < self.TIER_THRESHOLDS[self.TIER_ACTIVE]:
-                    state.tier = self.TIER_ACTIVE
-                elif time_since_interaction < self.TIER_THRESHOLDS[self.TIER_NEARBY]:
-                    state.tier = self.TIER_NEARBY
-                elif time_since_interaction < self.TIER_THRESHOLDS[self.TIER_IDLE]:
-                    state.tier = self.TIER_IDLE
-                else:
-                    state.tier = self.TIER_DORMANT
+            n = self._count
+            since_interaction_ns = now_ns - self._last_interaction_ns[:n]
+            _classify_tiers(since_interaction_ns, self._THRESHOLD_EDGES_NS, self._FREQ_BY_CODE,
+                            self._tier_freq[:n], self._tier[:n])
     
     def get_npcs_to_update(self) -> List[str]:
         """Get list of NPCs that should be updated this tick"""
         self._current_tick += 1
-        npcs_to_update = []
         
         with self._lock:
-            for npc_id, state in self._npc_states.items():
-                frequency = self.TIER_FREQUENCIES[state.tier]
-                if self._current_tick % frequency == 0:
-                    npcs_to_update.append(npc_id)
-                    state.last_update = time.time()
-        
-        return npcs_to_update
+            n = self._count
+            due = (self._current_tick % self._tier_freq[:n]) == 0
+            self._last_update_ns[:n][due] = time.monotonic_ns()
+            return self._ids[:n][due].tolist()
     
-    def get_npcs_in_zone(self, zone: str) -> List[str]:
-        """Get all NPCs in a specific zone"""
+    def get_npc_state(self, npc_id: str) -> Optional[NPCActivityState]:
+        """Snapshot of one NPC's activity state, or None if not registered"""
         with self._lock:
-            return self._zones.get(zone, []).copy()
+            i = self._id_to_idx.get(npc_id)
+            if i is None:
+                return None
+            return NPCActivityState(
+                npc_id=npc_id,
+                last_interaction=self._to_wall(self._last_interaction_ns[i]),
+                last_update=self._to_wall(self._last_update_ns[i]),
+                interaction_count_recent=int(self._interaction_count[i]),
+                zone=self._npc_zone[i],
+                tier=self.TIERS[self._tier[i]]
+            )
+    
+    def _to_wall(self, mono_ns: int) -> float:
+        """Convert a stored monotonic_ns time to a wall-clock timestamp (0.0 = never)"""
+        if mono_ns == self._NEVER:
+            return 0.0
+        return time.time() - (time.monotonic_ns() - int(mono_ns)) / 1e9
+    
+    def get_npcs_in_zone(self, zone: str) -> Tuple[str, ...]:
+        """Get all NPCs in a specific zone (shared immutable tuple, no copy)"""
+        return self._zones.get(zone, ())
     
     def get_active_npcs(self) -> List[str]:
         """Get all NPCs in ACTIVE or NEARBY tier"""
         with self._lock:
-            return [
-                npc_id for npc_id, state in self._npc_states.items()
-                if state.tier in (self.TIER_ACTIVE, self.TIER_NEARBY)
-            ]
+            n = self._count
+            nearby = self._TIER_CODES[self.TIER_NEARBY]
+            return self._ids[:n][self._tier[:n] <= nearby].tolist()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics"""
         with self._lock:
-            tier_counts = {tier: 0 for tier in self.TIER_FREQUENCIES.keys()}
-            for state in self._npc_states.values():
-                tier_counts[state.tier] += 1
+            counts = np.bincount(self._tier[:self._count], minlength=len(self.TIERS))
+            tier_counts = dict(zip(self.TIERS, counts.tolist()))
             
             return {
-                "total_npcs": len(self._npc_states),
+                "total_npcs": self._count,
                 "tier_distribution": tier_counts,
                 "zones": len(self._zones),
                 "current_tick": self._current_tick
@@ -315,62 +521,245 @@ class TieredUpdateSystem:
 # Batch Operations Manager
 # ============================================================================
 
+# Per-NPC memory and relationship aggregates; {values} is "(?),(?),..." for the ids
+_NPC_DATA_SQL = """
+    WITH ids(npc_id) AS (VALUES {values})
+    SELECT ids.npc_id, m.memory_count, m.avg_strength, r.relationship_count
+    FROM ids
+    LEFT JOIN (
+        SELECT npc_id, COUNT(*) AS memory_count,
+               AVG(current_strength) AS avg_strength
+        FROM conversation_topics
+        WHERE npc_id IN (SELECT npc_id FROM ids)
+        GROUP BY npc_id
+    ) m USING (npc_id)
+    LEFT JOIN (
+        SELECT npc1_id AS npc_id, COUNT(*) AS relationship_count
+        FROM npc_relationships
+        WHERE npc1_id IN (SELECT npc_id FROM ids)
+        GROUP BY npc1_id
+    ) r USING (npc_id)
+"""
+
+# Memory dict -> conversation_topics row, in column order
+_memory_row = itemgetter(
+    'id', 'player_id', 'npc_id', 'topic_category', 'content', 'emotional_weight',
+    'timestamp', 'last_accessed', 'decay_rate', 'current_strength'
+)
+
 class BatchOperationsManager:
-    """Handles batch database operations for efficiency"""
+    """Handles batch database operations for efficiency
+    
+    Producers append to a per-thread deque without taking a shared lock;
+    a background writer thread drains the buffers and commits them in
+    transactions of at most _batch_size writes (auto-tuned so each
+    transaction holds SQLite's write lock for a bounded time).
+    """
+    
+    FLUSH_INTERVAL = 0.01  # Max delay between a write being queued and flushed
     
-    def __init__(self, connection_pool: ConnectionPool):
+    # Batch size auto-tuning: keep p95 flush time between these bounds (seconds)
+    FLUSH_TARGET_LOW = 0.005
+    FLUSH_TARGET_HIGH = 0.02
+    MIN_BATCH_SIZE = 16
+    MAX_BATCH_SIZE = 2000
+    TUNE_EVERY = 32  # flushes between adjustments
+    MAX_FLUSH_ATTEMPTS = 3  # a failed batch is retried this many times, then dropped
+    
+    def __init__(self, connection_pool: ConnectionPool,
+                 performance: Optional["PerformanceMonitor"] = None):
         self.pool = connection_pool
-        self._pending_writes: List[Tuple[str, tuple]] = []
-        self._lock = threading.Lock()
+        self.performance = performance
+        self._flushes = 0
+        self._tls = threading.local()
+        # Every producer's buffer; kept strongly so writes queued by a
+        # thread that has since exited are still flushed
+        self._buffers: List[Deque[Tuple[str, tuple]]] = []
+        self._buffers_lock = threading.Lock()  # only taken when a thread first writes
+        # All writes go through one dedicated connection, so pooled readers
+        # never queue behind SQLite's write lock
+        self._writer_conn = connection_pool._create_connection()
+        self._writer_cursor = self._writer_conn.cursor()  # reused by every write
+        self._writer_lock = threading.Lock()  # guards _writer_conn
         self._batch_size = 100
+        self._retry: List[Tuple[str, tuple]] = []  # batch from a failed flush, written first
+        self._next_buffer = 0  # round-robin start so no producer is starved by a busy one
+        self._failed_flushes = 0
+        self._npc_data_sql: Dict[int, str] = {}  # padded id count -> batch_get_npc_data SQL
+        self._wake = threading.Event()
+        self._idle = False  # writer is (about to be) blocked waiting for a first write
+        self._running = True
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="batch-writer", daemon=True)
+        self._writer_thread.start()
+    
+    def _buffer(self) -> Deque[Tuple[str, tuple]]:
+        """This thread's write buffer (registered on first use)"""
+        buf = getattr(self._tls, "buf", None)
+        if buf is None:
+            buf = self._tls.buf = deque()
+            with self._buffers_lock:
+                self._buffers.append(buf)
+        return buf
     
     def queue_write(self, sql: str, params: tuple):
         """Queue a write operation for batch execution"""
-        with self._lock:
-            self._pending_writes.append((sql, params))
-            
-            if len(self._pending_writes) >= self._batch_size:
-                self._flush_writes()
+        buf = self._buffer()
+        buf.append((sql, params))
+        
+        # Append before reading _idle: the writer sets _idle before checking for work
+        if self._idle or len(buf) >= self._batch_size:
+            self._idle = False
+            self._wake.set()
+    
+    def _pending(self) -> int:
+        """Number of writes waiting to be flushed"""
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+        return len(self._retry) + sum(map(len, buffers))
+    
+    def _drain(self, limit: int) -> List[Tuple[str, tuple]]:
+        """Take up to limit buffered writes (a failed batch first)"""
+        writes = self._retry[:limit]
+        del self._retry[:limit]
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+        if not buffers:
+            return writes
+        start = self._next_buffer % len(buffers)
+        self._next_buffer = start + 1
+        for buf in buffers[start:] + buffers[:start]:
+            # popleft is atomic, so producers can keep appending meanwhile
+            for _ in range(min(len(buf), limit - len(writes))):
+                writes.append(buf.popleft())
+            if len(writes) >= limit:
+                break
+        return writes
     
-    def _flush_writes(self):
-        """Execute all pending writes in a single transaction"""
-        if not self._pending_writes:
+    def _writer_loop(self):
+        """Background writer: commit buffered writes within FLUSH_INTERVAL of the first one"""
+        while self._running:
+            self._idle = True
+            if not self._pending():
+                self._wake.wait()  # Nothing buffered: sleep until a write arrives
+            self._idle = False
+            self._wake.clear()
+            # Let the batch fill for up to FLUSH_INTERVAL (a full buffer wakes us early)
+            self._wake.wait(self.FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # Logged and rolled back; the batch is retried by flush()
+    
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT on the writer cursor, ROLLBACK on error (caller holds _writer_lock)"""
+        cursor = self._writer_cursor
+        # IMMEDIATE takes the write lock up front instead of upgrading mid-transaction
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            # Inside the try: a failed COMMIT (SQLITE_BUSY, disk full) must roll back too,
+            # or every later BEGIN fails with "cannot start a transaction within a transaction"
+            cursor.execute("COMMIT")
+        except BaseException:
+            if self._writer_conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+    
+    def _flush_writes(self, writes: List[Tuple[str, tuple]]):
+        """Execute the given writes in a single transaction (caller holds _writer_lock)"""
+        if not writes:
             return
         
-        writes = self._pending_writes.copy()
-        self._pending_writes.clear()
+        start = time.perf_counter()
+        try:
+            with self._transaction() as cursor:
+                # One executemany per run of identical SQL; runs keep queue order
+                for sql, run in groupby(writes, key=itemgetter(0)):
+                    cursor.executemany(sql, map(itemgetter(1), run))
+        except Exception as e:
+            print(f"Batch write error: {e}")
+            raise
         
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                for sql, params in writes:
-                    cursor.execute(sql, params)
-                conn.commit()
-            except Exception as e:
-                conn.rollback()
-                print(f"Batch write error: {e}")
-                raise
+        if self.performance is not None:
+            self.performance.record("batch_flush", time.perf_counter() - start)
+            self._flushes += 1
+            if self._flushes % self.TUNE_EVERY == 0:
+                self._tune_batch_size()
+    
+    def _tune_batch_size(self):
+        """Grow or shrink the batch size to keep flush latency on target (caller holds _writer_lock)"""
+        p95 = self.performance.get_stats("batch_flush").get("p95")
+        if p95 is None:
+            return
+        if p95 < self.FLUSH_TARGET_LOW:
+            self._batch_size = min(self.MAX_BATCH_SIZE, int(self._batch_size * 1.25))
+        elif p95 > self.FLUSH_TARGET_HIGH:
+            self._batch_size = max(self.MIN_BATCH_SIZE, int(self._batch_size / 1.5))
     
     def flush(self):
-        """Force flush pending writes"""
-        with self._lock:
-            self._flush_writes()
+        """Force flush pending writes, one transaction per _batch_size writes"""
+        with self._writer_lock:
+            # Only what is pending now, so steady producers can't keep us here
+            remaining = self._pending()
+            while remaining > 0:
+                writes = self._drain(min(self._batch_size, remaining))
+                if not writes:
+                    break
+                remaining -= len(writes)
+                self._flush_batch(writes)
     
-    def batch_memory_decay(self, decay_rate: float, min_strength: float = 0.1) -> int:
-        """Apply memory decay to all memories in a single batch operation"""
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            
+    def _flush_batch(self, writes: List[Tuple[str, tuple]]):
+        """Flush one batch, keeping it for retry on failure (caller holds _writer_lock)"""
+        try:
+            self._flush_writes(writes)
+        except Exception:
+            self._failed_flushes += 1
+            if self._failed_flushes < self.MAX_FLUSH_ATTEMPTS:
+                self._retry = writes + self._retry
+            else:
+                print(f"⚠ Batch writer dropped {len(writes)} writes after "
+                      f"{self._failed_flushes} failed flushes")
+                self._failed_flushes = 0
+            raise
+        self._failed_flushes = 0
+    
+    def close(self):
+        """Stop the writer thread and commit anything still buffered"""
+        self._running = False
+        self._wake.set()
+        self._writer_thread.join()
+        self.flush()
+    
+    def batch_memory_decay(self, decay_rate: float, min_strength: float = 0.1,
+                           cleanup_below: Optional[float] = None) -> int:
+        """Apply memory decay to all memories in a single batch operation
+        
+        With cleanup_below, memories under that strength are deleted in the
+        same transaction (as batch_cleanup_memories would).
+        """
+        with self._writer_lock:
             # Update all memories in single query (use conversation_topics table)
+            # SQLite only uses a partial index when the WHERE spells out its
+            # condition literally; a bound :min_s alone can never match it
+            live = f"current_strength > {IndexManager.LIVE_STRENGTH}"
+            where = f"{live} AND " if min_strength >= IndexManager.LIVE_STRENGTH else ""
             try:
-                cursor.execute("""
-                    UPDATE conversation_topics 
-                    SET current_strength = MAX(?, current_strength * (1 - ? * decay_rate))
-                    WHERE current_strength > ?
-                """, (min_strength, decay_rate, min_strength))
-                
-                affected = cursor.rowcount
-                conn.commit()
+                with self._transaction() as cursor:
+                    cursor.execute(f"""
+                        UPDATE conversation_topics 
+                        SET current_strength = MAX(:min_s, current_strength * (1 - :rate * decay_rate))
+                        WHERE {where}current_strength > :min_s
+                    """, {"min_s": min_strength, "rate": decay_rate})
+                    affected = cursor.rowcount
+                    
+                    if cleanup_below is not None:
+                        cursor.execute(
+                            "DELETE FROM conversation_topics WHERE current_strength < ?",
+                            (cleanup_below,)
+                        )
                 return affected
             except Exception:
                 # Table might not exist or have different schema
@@ -378,17 +767,14 @@ class BatchOperationsManager:
     
     def batch_cleanup_memories(self, threshold: float = 0.1) -> int:
         """Remove all memories below threshold in single operation"""
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            
+        with self._writer_lock:
             try:
-                cursor.execute(
-                    "DELETE FROM conversation_topics WHERE current_strength < ?",
-                    (threshold,)
-                )
-                
-                deleted = cursor.rowcount
-                conn.commit()
+                with self._transaction() as cursor:
+                    cursor.execute(
+                        "DELETE FROM conversation_topics WHERE current_strength < ?",
+                        (threshold,)
+                    )
+                    deleted = cursor.rowcount
                 return deleted
             except Exception:
                 # Table might not exist or have different schema
@@ -399,23 +785,22 @@ class BatchOperationsManager:
         if not memories:
             return 0
         
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            
+        with self._writer_lock:
             try:
-                cursor.executemany("""
-                    INSERT OR REPLACE INTO conversation_topics 
-                    (id, player_id, npc_id, topic_category, content, emotional_weight, 
-                     timestamp, last_accessed, decay_rate, current_strength)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    (m['id'], m['player_id'], m['npc_id'], m['topic_category'], 
-                     m['content'], m['emotional_weight'], m['timestamp'],
-                     m['last_accessed'], m['decay_rate'], m['current_strength'])
-                    for m in memories
-                ])
-                
-                conn.commit()
+                # Upsert in place: identity columns are never rewritten, so
+                # their indexes are untouched when a memory is refreshed
+                with self._transaction() as cursor:
+                    cursor.executemany("""
+                        INSERT INTO conversation_topics 
+                        (id, player_id, npc_id, topic_category, content, emotional_weight, 
+                         timestamp, last_accessed, decay_rate, current_strength)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(id) DO UPDATE SET
+                            content = excluded.content,
+                            emotional_weight = excluded.emotional_weight,
+                            last_accessed = excluded.last_accessed,
+                            current_strength = excluded.current_strength
+                    """, map(_memory_row, memories))
                 return len(memories)
             except Exception:
                 return 0
@@ -425,48 +810,45 @@ class BatchOperationsManager:
         if not npc_ids:
             return {}
         
-        placeholders = ','.join(['?' for _ in npc_ids])
+        # Pad the id list to a power of two with NULLs (which match nothing), so
+        # only a handful of distinct SQL texts exist and the statement cache hits
+        size = 1 << (len(npc_ids) - 1).bit_length()
+        params = list(npc_ids) + [None] * (size - len(npc_ids))
+        sql = self._npc_data_sql.get(size)
+        if sql is None:
+            sql = self._npc_data_sql[size] = _NPC_DATA_SQL.format(values=','.join(['(?)'] * size))
+        
+        result = {
+            npc_id: {"npc_id": npc_id, "memory_stats": {}, "relationship_stats": {}}
+            for npc_id in npc_ids
+        }
         
-        with self.pool.get_connection() as conn:
+        with self.pool.get_ro_connection() as conn:
             cursor = conn.cursor()
             
-            # Get memories from conversation_topics table
-            memory_stats = {}
+            # Memory and relationship aggregates for every requested NPC at once
             try:
-                cursor.execute(f"""
-                    SELECT npc_id, COUNT(*) as memory_count, 
-                           AVG(current_strength) as avg_strength
-                    FROM conversation_topics 
-                    WHERE npc_id IN ({placeholders})
-                    GROUP BY npc_id
-                """, npc_ids)
-                memory_stats = {row['npc_id']: dict(row) for row in cursor.fetchall()}
-            except Exception:
-                # Table might not exist or have different schema
-                pass
-            
-            # Get relationship counts
-            relationship_stats = {}
-            try:
-                cursor.execute(f"""
-                    SELECT npc1_id as npc_id, COUNT(*) as relationship_count
-                    FROM npc_relationships 
-                    WHERE npc1_id IN ({placeholders})
-                    GROUP BY npc1_id
-                """, npc_ids)
-                relationship_stats = {row['npc_id']: dict(row) for row in cursor.fetchall()}
+                cursor.execute(sql, params)
+                
+                for npc_id, memory_count, avg_strength, relationship_count in cursor.fetchall():
+                    if npc_id is None:
+                        continue  # padding row
+                    entry = result[npc_id]
+                    if memory_count is not None:
+                        entry["memory_stats"] = {
+                            "npc_id": npc_id,
+                            "memory_count": memory_count,
+                            "avg_strength": avg_strength
+                        }
+                    if relationship_count is not None:
+                        entry["relationship_stats"] = {
+                            "npc_id": npc_id,
+                            "relationship_count": relationship_count
+                        }
             except Exception:
+                # Tables might not exist or have different schema
                 pass
             
-            # Combine results
-            result = {}
-            for npc_id in npc_ids:
-                result[npc_id] = {
-                    "npc_id": npc_id,
-                    "memory_stats": memory_stats.get(npc_id, {}),
-                    "relationship_stats": relationship_stats.get(npc_id, {})
-                }
-            
             return result
 
 
@@ -475,7 +857,14 @@ class BatchOperationsManager:
 # ============================================================================
 
 class IndexManager:
-    """Manages database indexes for performance"""
+    """Manages database indexes for performance
+    
+    An entry may carry a fourth element, a WHERE clause, making it a
+    partial index.
+    """
+    
+    # Memories at or below this strength are waiting for cleanup
+    LIVE_STRENGTH = 0.1
     
     INDEXES = [
         # Memory tables (conversation_topics is the actual table name)
@@ -483,6 +872,11 @@ class IndexManager:
         ("idx_conversation_topics_player", "conversation_topics", "player_id"),
         ("idx_conversation_topics_strength", "conversation_topics", "current_strength"),
         ("idx_conversation_topics_npc_player", "conversation_topics", "npc_id, player_id"),
+        # Covering: per-NPC COUNT/AVG(current_strength) answered from the index alone
+        ("idx_conversation_topics_npc_strength", "conversation_topics", "npc_id, current_strength"),
+        # Partial: decay only touches live rows, so the index skips the dead ones
+        ("idx_conversation_topics_live", "conversation_topics", "current_strength",
+         f"current_strength > {LIVE_STRENGTH}"),
         
         # Shared memories
         ("idx_shared_memories_target", "shared_memories", "target_npc_id"),
@@ -521,25 +915,28 @@ class IndexManager:
     @classmethod
     def create_indexes(cls, connection_pool: ConnectionPool):
         """Create all performance indexes"""
-        created = 0
-        skipped = 0
-        
         with connection_pool.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            for index_name, table, columns in cls.INDEXES:
-                try:
-                    cursor.execute(f"""
-                        CREATE INDEX IF NOT EXISTS {index_name} 
-                        ON {table} ({columns})
-                    """)
-                    created += 1
-                except sqlite3.OperationalError as e:
-                    # Table might not exist yet
-                    skipped += 1
+            # Skip indexes whose table or columns don't exist yet (a later start
+            # creates them), so the script below can't fail halfway
+            schema = {
+                (table, column) for table, column in conn.execute("""
+                    SELECT m.name, p.name
+                    FROM sqlite_master m, pragma_table_info(m.name) p
+                    WHERE m.type = 'table'
+                """)
+            }
+            statements = [
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})"
+                + (f" WHERE {where[0]};" if where else ";")
+                for index_name, table, columns, *where in cls.INDEXES
+                if all((table, c.strip()) in schema for c in columns.split(','))
+            ]
             
-            conn.commit()
+            # One script, one transaction, one parse pass
+            conn.executescript("BEGIN;\n" + "\n".join(statements) + "\nCOMMIT;")
         
+        created = len(statements)
+        skipped = len(cls.INDEXES) - created
         print(f"✓ Indexes: {created} created, {skipped} skipped")
         return created, skipped
     
@@ -549,7 +946,6 @@ class IndexManager:
         with connection_pool.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("ANALYZE")
-            conn.commit()
         
         print("✓ Table statistics updated")
 
@@ -559,24 +955,29 @@ class IndexManager:
 # ============================================================================
 
 class PerformanceMonitor:
-    """Monitors system performance metrics"""
+    """Monitors system performance metrics
+    
+    Each metric keeps its last _max_samples values in a fixed NumPy ring
+    buffer; percentiles are found with np.partition instead of a full sort.
+    """
     
     def __init__(self):
-        self._metrics: Dict[str, List[float]] = {}
+        self._metrics: Dict[str, np.ndarray] = {}
+        self._heads: Dict[str, int] = {}  # total samples recorded per metric
         self._lock = threading.Lock()
         self._max_samples = 1000
     
     def record(self, metric_name: str, value: float):
         """Record a metric value"""
         with self._lock:
-            if metric_name not in self._metrics:
-                self._metrics[metric_name] = []
-            
-            self._metrics[metric_name].append(value)
+            samples = self._metrics.get(metric_name)
+            if samples is None:
+                samples = self._metrics[metric_name] = np.empty(self._max_samples, dtype=np.float64)
+                self._heads[metric_name] = 0
             
-            # Keep only recent samples
-            if len(self._metrics[metric_name]) > self._max_samples:
-                self._metrics[metric_name] = self._metrics[metric_name][-self._max_samples:]
+            head = self._heads[metric_name]
+            samples[head % self._max_samples] = value  # Overwrites the oldest once full
+            self._heads[metric_name] = head + 1
     
     @contextmanager
     def measure(self, metric_name: str):
@@ -588,31 +989,47 @@ class PerformanceMonitor:
             duration = time.time() - start
             self.record(metric_name, duration)
     
+    def _snapshot(self, metric_name: str) -> Optional[np.ndarray]:
+        """Copy of a metric's recorded samples (caller holds _lock)"""
+        samples = self._metrics.get(metric_name)
+        if samples is None:
+            return None
+        return samples[:min(self._heads[metric_name], self._max_samples)].copy()
+    
+    @staticmethod
+    def _summarize(values: Optional[np.ndarray]) -> Dict[str, float]:
+        """Statistics over a private copy of samples (partitioned in place)"""
+        if values is None:
+            return {"count": 0}
+        
+        n = len(values)
+        avg, lo, hi = float(values.mean()), float(values.min()), float(values.max())
+        i50 = n // 2
+        i95 = int(n * 0.95) if n > 20 else n - 1
+        i99 = int(n * 0.99) if n > 100 else n - 1
+        values.partition(sorted({i50, i95, i99}))
+        
+        return {
+            "count": n,
+            "avg": avg,
+            "min": lo,
+            "max": hi,
+            "p50": float(values[i50]),
+            "p95": float(values[i95]),
+            "p99": float(values[i99])
+        }
+    
     def get_stats(self, metric_name: str) -> Dict[str, float]:
         """Get statistics for a metric"""
         with self._lock:
-            values = self._metrics.get(metric_name, [])
-            
-            if not values:
-                return {"count": 0}
-            
-            sorted_values = sorted(values)
-            n = len(values)
-            
-            return {
-                "count": n,
-                "avg": sum(values) / n,
-                "min": min(values),
-                "max": max(values),
-                "p50": sorted_values[n // 2],
-                "p95": sorted_values[int(n * 0.95)] if n > 20 else sorted_values[-1],
-                "p99": sorted_values[int(n * 0.99)] if n > 100 else sorted_values[-1]
-            }
+            values = self._snapshot(metric_name)
+        return self._summarize(values)
     
     def get_all_stats(self) -> Dict[str, Dict[str, float]]:
         """Get statistics for all metrics"""
         with self._lock:
-            return {name: self.get_stats(name) for name in self._metrics.keys()}
+            snapshots = {name: self._snapshot(name) for name in self._metrics.keys()}
+        return {name: self._summarize(values) for name, values in snapshots.items()}
 
 
 # ============================================================================
@@ -632,25 +1049,36 @@ class GlobalScalingManager:
         self.connection_pool = ConnectionPool(self.db_path, pool_size=10)
         self.cache = TTLCache(max_size=5000, ttl_seconds=300)
         self.tiered_updates = TieredUpdateSystem()
-        self.batch_ops = BatchOperationsManager(self.connection_pool)
         self.performance = PerformanceMonitor()
+        self.batch_ops = BatchOperationsManager(self.connection_pool, self.performance)
         
         # Create indexes
         IndexManager.create_indexes(self.connection_pool)
         
         print("✓ Global Scaling Manager initialized")
     
-    def register_npc(self, npc_id: str, zone: str = "default"):
-        """Register an NPC for tiered updates"""
-        self.tiered_updates.register_npc(npc_id, zone)
+    def register_npc(self, npc_id: str, zone: str = "default") -> int:
+        """Register an NPC for tiered updates, returning its integer handle"""
+        return self.tiered_updates.register_npc(npc_id, zone)
     
     def record_interaction(self, npc_id: str):
         """Record an NPC interaction (promotes to active tier)"""
         self.tiered_updates.record_interaction(npc_id)
-        self.cache.invalidate_prefix(f"npc:{npc_id}")
+        self.cache.invalidate_tag(f"npc:{npc_id}")
     
-    def get_cached_or_fetch(self, key: str, fetch_fn, ttl: int = None) -> Any:
-        """Get from cache or fetch using provided function"""
+    def record_interactions(self, npc_ids: Iterable[str]):
+        """Record interactions for many NPCs at once (one tier pass, one invalidation pass)"""
+        npc_ids = list(npc_ids)
+        self.tiered_updates.record_interactions_batch(npc_ids)
+        self.cache.invalidate_tags({f"npc:{npc_id}" for npc_id in npc_ids})
+    
+    def get_cached_or_fetch(self, key: str, fetch_fn, ttl: int = None,
+                            tag: Optional[str] = None) -> Any:
+        """Get from cache or fetch using provided function
+        
+        Keys of the form "npc:<id>:..." are tagged "npc:<id>" by default, so
+        record_interaction invalidates them.
+        """
         cached = self.cache.get(key)
         if cached is not None:
             return cached
@@ -658,7 +1086,9 @@ class GlobalScalingManager:
         with self.performance.measure(f"fetch:{key.split(':')[0]}"):
             result = fetch_fn()
         
-        self.cache.set(key, result)
+        if tag is None and key.startswith("npc:"):
+            tag = ":".join(key.split(":", 2)[:2])
+        self.cache.set(key, result, tag)
         return result
     
     def process_world_tick(self) -> Dict[str, Any]:
@@ -678,10 +1108,15 @@ class GlobalScalingManager:
             
             return {
                 "npcs_updated": len(npcs_to_update),
-                "memories_decayed": decayed,
-                "tier_stats": self.tiered_updates.get_stats()
+                "memories_decayed": decayed
             }
     
+    def process_world_tick_with_stats(self) -> Dict[str, Any]:
+        """Process a world tick and include tier statistics (for telemetry)"""
+        result = self.process_world_tick()
+        result["tier_stats"] = self.tiered_updates.get_stats()
+        return result
+    
     def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
         return {
@@ -692,7 +1127,7 @@ class GlobalScalingManager:
     
     def cleanup(self):
         """Cleanup resources"""
-        self.batch_ops.flush()
+        self.batch_ops.close()
         self.connection_pool.close_all()
 
 
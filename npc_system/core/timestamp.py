@@ -0,0 +1,17 @@
+"""
+Timestamp helpers
+Caches the formatted ISO timestamp so hot paths don't rebuild it every call
+"""
+import time
+from datetime import datetime
+
+# [epoch seconds, formatted string] of the last formatted timestamp
+_last = [0.0, ""]
+
+def now_iso() -> str:
+    """Local-time ISO timestamp, reformatted at most once per millisecond"""
+    t = time.time()
+    if abs(t - _last[0]) >= 0.001:
+        _last[1] = datetime.fromtimestamp(t).isoformat()
+        _last[0] = t
+    return _last[1]
@@ -5,16 +5,32 @@ Includes voice cloning capability for custom NPC voices
 """
 import os
 import io
+import atexit
 import base64
 import hashlib
+import heapq
 import json
-from typing import Dict, Optional, List, Tuple
+import types
+import wave
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Mapping, Optional, List, Tuple
 from dataclasses import dataclass, field
-from elevenlabs import ElevenLabs, VoiceSettings
+from elevenlabs import AsyncElevenLabs, ElevenLabs, VoiceSettings
 import asyncio
 import sqlite3
+import threading
 from pathlib import Path
 
+import numpy as np
+
+# Optional JIT for the bulk fingerprint kernel (falls back to plain NumPy)
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # ElevenLabs API Key
 ELEVENLABS_API_KEY = os.environ.get("ELEVENLABS_API_KEY", "")
 
@@ -29,6 +45,20 @@ except ImportError:
     except ImportError:
         VOICE_DB_PATH = "/app/npc_system/database/voice_assignments.db"
 
+# Optional on-disk speech cache (e.g. <database dir>/audio_cache); unset disables it
+VOICE_AUDIO_CACHE_DIR = os.environ.get("VOICE_AUDIO_CACHE_DIR", "")
+# Disk budget for that cache; least recently used clips are deleted past it
+VOICE_AUDIO_CACHE_MAX_BYTES = int(os.environ.get("VOICE_AUDIO_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+
+# ElevenLabs model used for all speech (~2x faster than multilingual)
+TTS_MODEL_ID = "eleven_turbo_v2_5"
+
+# ElevenLabs output formats: the SDK's default MP3, and raw 16-bit mono PCM
+# that is wrapped in a WAV header locally (no MP3 decode/re-encode)
+DEFAULT_AUDIO_FORMAT = "mp3_44100_128"
+WAV_PCM_FORMAT = "pcm_24000"
+WAV_SAMPLE_RATE = 24000
+
 # ============================================================================
 # Voice Profiles - Maps NPC characteristics to ElevenLabs voices
 # ============================================================================
@@ -55,15 +85,28 @@ class NPCVoiceFingerprint:
     style_mod: float = 0.0
     speed_mod: float = 1.0  # 0.5 to 2.0
     pitch_description: str = "normal"  # For reference
+    # (base profile, modifiers, settings) from the last get_effective_settings call
+    _settings_cache: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
     
     def get_effective_settings(self, base_profile: VoiceProfile) -> Dict:
-        """Calculate effective voice settings"""
-        return {
+        """Calculate effective voice settings
+        
+        Computed once per base profile and modifier values; the returned dict
+        is shared, so treat it as read-only.
+        """
+        mods = (self.stability_mod, self.similarity_mod, self.style_mod)
+        cache = self._settings_cache
+        if cache is not None and cache[0] is base_profile and cache[1] == mods:
+            return cache[2]
+        
+        settings = {
             "stability": max(0.1, min(1.0, base_profile.stability + self.stability_mod)),
             "similarity_boost": max(0.1, min(1.0, base_profile.similarity_boost + self.similarity_mod)),
             "style": max(0.0, min(1.0, base_profile.style + self.style_mod)),
             "use_speaker_boost": base_profile.use_speaker_boost
         }
+        self._settings_cache = (base_profile, mods, settings)
+        return settings
 
 # ElevenLabs Pre-made Voices mapped to NPC archetypes
 VOICE_LIBRARY = {
@@ -103,6 +146,15 @@ VOICE_LIBRARY = {
     "mimi": VoiceProfile("zrHiDhphv9ZnVXBqCLjz", "Mimi", "Swedish female - foreign merchants", 0.45, 0.7),
 }
 
+# Library voices by gender, in the order unique-voice assignment tries them
+_MALE_VOICES = ("adam", "antoni", "arnold", "josh", "sam", "daniel", "charlie", "clyde", "ethan", "harry", "james")
+_FEMALE_VOICES = ("rachel", "domi", "bella", "elli", "emily", "grace", "charlotte", "serena", "glinda", "mimi")
+_GENDER_VOICES = types.MappingProxyType({"male": _MALE_VOICES, "female": _FEMALE_VOICES})
+# voice -> (gender, position in its gender tuple); position breaks usage ties
+_VOICE_SLOT = types.MappingProxyType({
+    voice: (gender, i) for gender, voices in _GENDER_VOICES.items() for i, voice in enumerate(voices)
+})
+
 # Role-to-Voice Mapping - Now split by gender
 # Maps roles to preferred voice styles for each gender
 ROLE_VOICE_MAP_MALE = {
@@ -172,11 +224,52 @@ ROLE_VOICE_MAP_FEMALE = {
     "child": "elli", "elder": "rachel", "foreigner": "mimi",
 }
 
+# Read-only views, plus one table keyed by (gender, role) so an exact role
+# match is a single lookup
+ROLE_VOICE_MAP_MALE = types.MappingProxyType(ROLE_VOICE_MAP_MALE)
+ROLE_VOICE_MAP_FEMALE = types.MappingProxyType(ROLE_VOICE_MAP_FEMALE)
+ROLE_VOICE_MAP: Mapping[Tuple[str, str], str] = types.MappingProxyType({
+    **{("male", role): voice for role, voice in ROLE_VOICE_MAP_MALE.items()},
+    **{("female", role): voice for role, voice in ROLE_VOICE_MAP_FEMALE.items()},
+})
+
+@lru_cache(maxsize=1024)
+def _match_role_voice(gender_key: str, role_lower: str) -> Optional[str]:
+    """Voice for a normalized role: exact match, else the first partial match
+    
+    Roles repeat across NPCs, so the substring scan runs once per distinct role.
+    """
+    base_voice = ROLE_VOICE_MAP.get((gender_key, role_lower))
+    if base_voice:
+        return base_voice
+    
+    role_map = ROLE_VOICE_MAP_FEMALE if gender_key == "female" else ROLE_VOICE_MAP_MALE
+    for role_key, voice in role_map.items():
+        if role_key in role_lower or role_lower in role_key:
+            return voice
+    return None
+
 # ============================================================================
 # Personality-Based Voice Modifiers
 # These create unique "fingerprints" for each NPC
 # ============================================================================
 
+# Trait order of the personality tuples passed to _compute_mods
+_TRAIT_ORDER = (
+    "curiosity", "empathy", "risk_tolerance", "aggression",
+    "discipline", "romanticism", "opportunism", "paranoia",
+)
+# Neutral value for any trait a persona leaves out
+_DEFAULT_PERSONALITY = types.MappingProxyType(dict.fromkeys(_TRAIT_ORDER, 0.5))
+# Merged personality dict -> trait tuple in _TRAIT_ORDER
+_trait_values = itemgetter(*_TRAIT_ORDER)
+
+# Pitch labels in priority order, the trait column each one checks, and "normal"
+_PITCH_LABELS = ("harsh, aggressive", "warm, gentle", "nervous, hushed",
+                 "controlled, precise", "expressive, dramatic", "normal")
+_PITCH_TRAIT_IDX = tuple(_TRAIT_ORDER.index(trait) for trait in
+                         ("aggression", "empathy", "paranoia", "discipline", "romanticism"))
+
 def calculate_voice_fingerprint(
     npc_id: str,
     personality: Dict[str, float],
@@ -197,38 +290,69 @@ def calculate_voice_fingerprint(
     - opportunism: Higher = smoother, persuasive
     - paranoia: Higher = more erratic, whisper-like
     """
+    # Extract personality traits with defaults (one merge instead of eight .get calls)
+    traits = _trait_values({**_DEFAULT_PERSONALITY, **(personality or {})})
+    return NPCVoiceFingerprint(npc_id, *_compute_mods(role, gender, traits))
+
+def calculate_voice_fingerprints(
+    npcs: List[Tuple[str, Dict[str, float], str, str]]
+) -> List[NPCVoiceFingerprint]:
+    """
+    Calculate fingerprints for many NPCs at once from
+    (npc_id, personality, role, gender) tuples.
+    Traits are laid out as one (N, 8) array, one column per trait, so the
+    modifier and pitch math are whole-column operations.
+    """
+    traits = np.array(
+        [_trait_values({**_DEFAULT_PERSONALITY, **(personality or {})}) for _, personality, _, _ in npcs],
+        dtype=np.float64
+    ).reshape(-1, len(_TRAIT_ORDER))
+    mods = np.empty((len(npcs), 4), dtype=np.float64)
+    _compute_mods_batch(traits, mods)
     
+    # First pitch trait above 0.7 (same priority as _pitch_description), else "normal"
+    pitch_codes = np.select(
+        [traits[:, i] > 0.7 for i in _PITCH_TRAIT_IDX],
+        np.arange(len(_PITCH_TRAIT_IDX)),
+        default=len(_PITCH_TRAIT_IDX)
+    )
+    
+    return [
+        NPCVoiceFingerprint(npc_id, _base_voice(role, gender), *row_mods, _PITCH_LABELS[code])
+        for (npc_id, _, role, gender), row_mods, code in zip(npcs, mods.tolist(), pitch_codes.tolist())
+    ]
+
+@lru_cache(maxsize=4096)
+def _compute_mods(role: str, gender: str, traits: Tuple[float, ...]) -> Tuple:
+    """(base voice, stability, similarity, style, speed, pitch description) for a fingerprint
+    
+    Pure in its arguments, so identical role/gender/personality combinations
+    are computed once.
+    """
+    return (_base_voice(role, gender), *map(float, _personality_mods(*traits)), _pitch_description(traits))
+
+def _base_voice(role: str, gender: str) -> str:
+    """Base voice key for a role and gender"""
     # Choose the correct role map based on gender
     gender_lower = gender.lower() if gender else "male"
-    role_map = ROLE_VOICE_MAP_FEMALE if gender_lower == "female" else ROLE_VOICE_MAP_MALE
+    gender_key = "female" if gender_lower == "female" else "male"
     
-    # Get base voice from role
+    # Get base voice from role (exact, then partial match)
     role_lower = role.lower().replace(" ", "_")
-    base_voice = role_map.get(role_lower)
-    
-    # Try partial matching
-    if not base_voice:
-        for role_key in role_map.keys():
-            if role_key in role_lower or role_lower in role_key:
-                base_voice = role_map[role_key]
-                break
+    base_voice = _match_role_voice(gender_key, role_lower)
     
     # Default fallback based on gender
     if not base_voice:
         base_voice = "rachel" if gender_lower == "female" else "adam"
+    return base_voice
+
+def _personality_mods(curiosity, empathy, risk_tolerance, aggression,
+                      discipline, romanticism, opportunism, paranoia):
+    """(stability, similarity, style, speed) modifiers from the eight traits
     
-    # Extract personality traits with defaults
-    curiosity = personality.get("curiosity", 0.5)
-    empathy = personality.get("empathy", 0.5)
-    risk_tolerance = personality.get("risk_tolerance", 0.5)
-    aggression = personality.get("aggression", 0.5)
-    discipline = personality.get("discipline", 0.5)
-    romanticism = personality.get("romanticism", 0.5)
-    opportunism = personality.get("opportunism", 0.5)
-    paranoia = personality.get("paranoia", 0.5)
-    
-    # Calculate modifiers based on personality
-    
+    Element-wise, so the same formulas serve single trait values, whole
+    trait columns (_compute_mods_batch_numpy) and the numba kernel.
+    """
     # Stability: discipline increases, aggression/paranoia decreases
     stability_mod = (discipline - 0.5) * 0.3 - (aggression - 0.5) * 0.2 - (paranoia - 0.5) * 0.25
     
@@ -242,33 +366,66 @@ def calculate_voice_fingerprint(
     speed_mod = 1.0 + (risk_tolerance - 0.5) * 0.2 + (aggression - 0.5) * 0.15
     
     # Clamp values
-    stability_mod = max(-0.3, min(0.3, stability_mod))
-    similarity_mod = max(-0.2, min(0.2, similarity_mod))
-    style_mod = max(-0.2, min(0.4, style_mod))
-    speed_mod = max(0.7, min(1.3, speed_mod))
-    
-    # Generate pitch description
-    if aggression > 0.7:
-        pitch_desc = "harsh, aggressive"
-    elif empathy > 0.7:
-        pitch_desc = "warm, gentle"
-    elif paranoia > 0.7:
-        pitch_desc = "nervous, hushed"
-    elif discipline > 0.7:
-        pitch_desc = "controlled, precise"
-    elif romanticism > 0.7:
-        pitch_desc = "expressive, dramatic"
-    else:
-        pitch_desc = "normal"
-    
-    return NPCVoiceFingerprint(
-        npc_id=npc_id,
-        base_voice_key=base_voice,
-        stability_mod=stability_mod,
-        similarity_mod=similarity_mod,
-        style_mod=style_mod,
-        speed_mod=speed_mod,
-        pitch_description=pitch_desc
+    stability_mod = np.minimum(np.maximum(stability_mod, -0.3), 0.3)
+    similarity_mod = np.minimum(np.maximum(similarity_mod, -0.2), 0.2)
+    style_mod = np.minimum(np.maximum(style_mod, -0.2), 0.4)
+    speed_mod = np.minimum(np.maximum(speed_mod, 0.7), 1.3)
+    
+    return stability_mod, similarity_mod, style_mod, speed_mod
+
+def _pitch_description(traits) -> str:
+    """Pitch label from a trait sequence in _TRAIT_ORDER: the first pitch trait above 0.7"""
+    for idx, label in zip(_PITCH_TRAIT_IDX, _PITCH_LABELS):
+        if traits[idx] > 0.7:
+            return label
+    return _PITCH_LABELS[-1]
+
+def _compute_mods_batch_numpy(traits: np.ndarray, out: np.ndarray):
+    """Fill out[i] with the modifiers for traits[i]"""
+    for col, mods in enumerate(_personality_mods(*traits.T)):
+        out[:, col] = mods
+
+# njit compiles on the first bulk call (or loads its on-disk cache), not at import
+if njit is not None:
+    _personality_mods_jit = njit(cache=True)(_personality_mods)
+    
+    @njit(parallel=True, cache=True)
+    def _compute_mods_batch(traits, out):
+        """Fill out[i] with the modifiers for traits[i]"""
+        for i in prange(traits.shape[0]):
+            t = traits[i]
+            out[i, 0], out[i, 1], out[i, 2], out[i, 3] = _personality_mods_jit(
+                t[0], t[1], t[2], t[3], t[4], t[5], t[6], t[7]
+            )
+else:
+    _compute_mods_batch = _compute_mods_batch_numpy
+
+# Faction adjustments as (stability_mod, similarity_mod, style_mod) deltas
+_FACTION_MODS = types.MappingProxyType({
+    "guards": (0.1, 0.05, 0.0),
+    "traders": (-0.05, 0.0, 0.1),
+    "citizens": (0.0, 0.0, 0.0),
+    "outcasts": (-0.15, 0.0, 0.05),
+})
+
+_INSERT_FINGERPRINT_SQL = """
+    INSERT OR REPLACE INTO voice_fingerprints 
+    (npc_id, base_voice_key, stability_mod, similarity_mod, style_mod, speed_mod, pitch_description)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_CLONED_VOICE_SQL = """
+    INSERT OR REPLACE INTO cloned_voices 
+    (npc_id, voice_id, voice_name, description)
+    VALUES (?, ?, ?, ?)
+"""
+
+def _fingerprint_row(fingerprint: NPCVoiceFingerprint) -> Tuple:
+    """Column values for _INSERT_FINGERPRINT_SQL"""
+    return (
+        fingerprint.npc_id, fingerprint.base_voice_key,
+        fingerprint.stability_mod, fingerprint.similarity_mod,
+        fingerprint.style_mod, fingerprint.speed_mod, fingerprint.pitch_description
     )
 
 # Mood-based voice adjustments
@@ -293,27 +450,58 @@ class NPCVoiceSystem:
     Supports voice cloning for custom NPC voices.
     """
     
+    # Memory budget for generated clips (repeated greetings, barks, taunts)
+    AUDIO_CACHE_BYTES = 64 * 1024 * 1024
+    
     def __init__(self, api_key: str = None):
         self.api_key = api_key or ELEVENLABS_API_KEY
         self.client = None
+        self.async_client = None
         self._voice_fingerprints: Dict[str, NPCVoiceFingerprint] = {}
         self._cloned_voices: Dict[str, VoiceProfile] = {}  # npc_id -> cloned voice
         self._voice_usage_count: Dict[str, int] = {}
+        # Per-gender min-heaps of (usage, position, voice); stale entries are
+        # skipped on read (lazy deletion)
+        self._usage_heaps: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._rebuild_usage_heaps()
+        # npc_id -> get_npc_voice_info result; dropped whenever the assignment changes
+        self._voice_info_cache: Dict[str, Dict] = {}
+        # Speech LRU keyed by SHA-256 of (model, format, voice, settings, text)
+        self._audio_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._audio_cache_bytes = 0
+        self._audio_cache_lock = threading.Lock()
+        self._audio_cache_dir = Path(VOICE_AUDIO_CACHE_DIR) if VOICE_AUDIO_CACHE_DIR else None
+        # Bytes on disk under _audio_cache_dir; None until the first write scans it
+        self._disk_cache_bytes: Optional[int] = None
+        self._disk_cache_lock = threading.Lock()
         
         if self.api_key:
             self.client = ElevenLabs(api_key=self.api_key)
+            self.async_client = AsyncElevenLabs(api_key=self.api_key)
             print("✓ Enhanced NPC Voice System initialized with ElevenLabs")
         else:
             print("⚠ NPC Voice System: No API key - voice generation disabled")
         
-        # Initialize database
+        # Initialize database (one connection for the lifetime of the system;
+        # autocommit, so every statement is its own transaction)
+        Path(VOICE_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(VOICE_DB_PATH, check_same_thread=False, isolation_level=None)
+        # WAL + NORMAL: commits append to the log without a full fsync
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-8000")
+        self._conn.execute("PRAGMA mmap_size=67108864")
+        self._db_lock = threading.Lock()
+        # Reused by every write (under _db_lock); identical SQL strings hit the
+        # connection's prepared-statement cache instead of being re-parsed
+        self._cursor = self._conn.cursor()
+        atexit.register(self._conn.close)
         self._init_database()
     
     def _init_database(self):
         """Initialize SQLite database for voice assignments"""
-        Path(VOICE_DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(VOICE_DB_PATH)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS voice_fingerprints (
@@ -338,8 +526,23 @@ class NPCVoiceSystem:
             )
         """)
         
-        conn.commit()
-        conn.close()
+        # Warm the in-memory fingerprints so returning NPCs never hit the DB
+        cursor.execute("""
+            SELECT npc_id, base_voice_key, stability_mod, similarity_mod,
+                   style_mod, speed_mod, pitch_description
+            FROM voice_fingerprints
+        """)
+        for row in cursor:
+            fingerprint = NPCVoiceFingerprint(*row)
+            self._voice_fingerprints[fingerprint.npc_id] = fingerprint
+        
+        # Usage counts aggregated by SQLite in one scan
+        cursor.execute("""
+            SELECT base_voice_key, COUNT(*) FROM voice_fingerprints
+            GROUP BY base_voice_key
+        """)
+        self._voice_usage_count.update(cursor.fetchall())
+        self._rebuild_usage_heaps()
     
     def assign_unique_voice(
         self,
@@ -354,6 +557,62 @@ class NPCVoiceSystem:
         Returns both the base voice profile and the unique fingerprint.
         ENSURES each NPC gets a unique base voice when possible.
         """
+        existing = self._existing_voice(npc_id)
+        if existing:
+            return existing
+        
+        # Create new fingerprint based on personality
+        fingerprint = calculate_voice_fingerprint(npc_id, personality or {}, role, gender)
+        fingerprint = self._register_fingerprint(fingerprint, gender, faction)
+        self._save_fingerprint(fingerprint)
+        
+        base_profile = VOICE_LIBRARY.get(fingerprint.base_voice_key, VOICE_LIBRARY["adam"])
+        return base_profile, fingerprint
+    
+    def bulk_assign_voices(
+        self,
+        npcs: List[Tuple[str, str, str, str, Optional[Dict[str, float]]]]
+    ) -> List[Tuple[VoiceProfile, NPCVoiceFingerprint]]:
+        """
+        Assign voices to many NPCs at once.
+        Takes (npc_id, role, gender, faction, personality) tuples; all new
+        fingerprints are written in a single transaction.
+        """
+        # Fingerprint math for every new NPC in one batch (first entry wins on duplicates)
+        computed = {}
+        for fingerprint in calculate_voice_fingerprints([
+            (npc_id, personality or {}, role, gender)
+            for npc_id, role, gender, faction, personality in npcs
+            if self._existing_voice(npc_id) is None
+        ]):
+            computed.setdefault(fingerprint.npc_id, fingerprint)
+        
+        results = []
+        created = []
+        for npc_id, role, gender, faction, personality in npcs:
+            existing = self._existing_voice(npc_id)
+            if existing:
+                results.append(existing)
+                continue
+            
+            fingerprint = self._register_fingerprint(computed[npc_id], gender, faction)
+            created.append(fingerprint)
+            results.append((VOICE_LIBRARY.get(fingerprint.base_voice_key, VOICE_LIBRARY["adam"]), fingerprint))
+        
+        if created:
+            with self._db_lock:
+                self._cursor.execute("BEGIN")
+                try:
+                    self._cursor.executemany(_INSERT_FINGERPRINT_SQL, [_fingerprint_row(fp) for fp in created])
+                except BaseException:
+                    self._cursor.execute("ROLLBACK")
+                    raise
+                self._cursor.execute("COMMIT")
+        
+        return results
+    
+    def _existing_voice(self, npc_id: str) -> Optional[Tuple[VoiceProfile, NPCVoiceFingerprint]]:
+        """Return the voice already assigned to an NPC (cloned or generated), if any"""
         # Check for existing cloned voice
         if npc_id in self._cloned_voices:
             cloned = self._cloned_voices[npc_id]
@@ -366,23 +625,22 @@ class NPCVoiceSystem:
             base_profile = VOICE_LIBRARY.get(fingerprint.base_voice_key, VOICE_LIBRARY["adam"])
             return base_profile, fingerprint
         
-        # Create new fingerprint based on personality
-        personality = personality or {}
-        fingerprint = calculate_voice_fingerprint(npc_id, personality, role, gender)
-        
+        return None
+    
+    def _register_fingerprint(
+        self,
+        fingerprint: NPCVoiceFingerprint,
+        gender: str,
+        faction: str
+    ) -> NPCVoiceFingerprint:
+        """Apply faction and uniqueness adjustments and track a new fingerprint (the caller persists it)"""
         # Apply faction adjustments
-        faction_mods = {
-            "guards": {"stability_mod": 0.1, "similarity_mod": 0.05},
-            "traders": {"stability_mod": -0.05, "style_mod": 0.1},
-            "citizens": {"stability_mod": 0.0, "similarity_mod": 0.0},
-            "outcasts": {"stability_mod": -0.15, "style_mod": 0.05},
-        }
-        
-        if faction in faction_mods:
-            mods = faction_mods[faction]
-            fingerprint.stability_mod += mods.get("stability_mod", 0)
-            fingerprint.similarity_mod += mods.get("similarity_mod", 0)
-            fingerprint.style_mod += mods.get("style_mod", 0)
+        mods = _FACTION_MODS.get(faction)
+        if mods:
+            stability, similarity, style = mods
+            fingerprint.stability_mod += stability
+            fingerprint.similarity_mod += similarity
+            fingerprint.style_mod += style
         
         # ALWAYS try to find a unique voice that hasn't been used yet
         base_voice = fingerprint.base_voice_key
@@ -398,69 +656,70 @@ class NPCVoiceSystem:
                 fingerprint.base_voice_key = alternative
         
         # Track voice usage
-        self._voice_usage_count[base_voice] = self._voice_usage_count.get(base_voice, 0) + 1
+        self._bump_usage(base_voice, 1)
         
         # Store fingerprint
-        self._voice_fingerprints[npc_id] = fingerprint
-        self._save_fingerprint(fingerprint)
-        
-        base_profile = VOICE_LIBRARY.get(fingerprint.base_voice_key, VOICE_LIBRARY["adam"])
-        return base_profile, fingerprint
+        self._voice_fingerprints[fingerprint.npc_id] = fingerprint
+        return fingerprint
     
     def _find_unique_voice(self, gender: str) -> Optional[str]:
-        """Find a voice of the given gender that hasn't been assigned to any NPC yet"""
-        gender_voices = {
-            "male": ["adam", "antoni", "arnold", "josh", "sam", "daniel", "charlie", "clyde", "ethan", "harry", "james"],
-            "female": ["rachel", "domi", "bella", "elli", "emily", "grace", "charlotte", "serena", "glinda", "mimi"]
-        }
+        """Find an unused voice of the given gender, else the least used one
         
-        candidates = gender_voices.get(gender.lower(), gender_voices["male"])
-        
-        # First, try to find a completely unused voice
-        for voice in candidates:
-            if self._voice_usage_count.get(voice, 0) == 0:
+        Ties go to the voice listed first for that gender.
+        """
+        gender_key = gender.lower()
+        heap = self._usage_heaps.get(gender_key) or self._usage_heaps["male"]
+        while True:
+            usage, _, voice = heap[0]
+            if self._voice_usage_count.get(voice, 0) == usage:
                 return voice
-        
-        # If all voices of this gender are used, find the least used one
-        return self._find_alternative_voice(candidates[0], gender)
+            heapq.heappop(heap)  # Stale entry
     
-    def _find_alternative_voice(self, current: str, gender: str) -> str:
-        """Find a less-used voice of the same gender"""
-        gender_voices = {
-            "male": ["adam", "antoni", "arnold", "josh", "sam", "daniel", "charlie", "clyde", "ethan", "harry", "james"],
-            "female": ["rachel", "domi", "bella", "elli", "emily", "grace", "charlotte", "serena", "glinda", "mimi"]
-        }
-        
-        candidates = gender_voices.get(gender.lower(), gender_voices["male"])
-        min_usage = float('inf')
-        best = current
-        
-        for voice in candidates:
-            usage = self._voice_usage_count.get(voice, 0)
-            if usage < min_usage:
-                min_usage = usage
-                best = voice
+    def _bump_usage(self, voice: str, delta: int):
+        """Adjust a voice's usage count and push its new count onto its gender heap"""
+        usage = self._voice_usage_count.get(voice, 0) + delta
+        if usage > 0:
+            self._voice_usage_count[voice] = usage
+        else:
+            self._voice_usage_count.pop(voice, None)
+            usage = 0
         
-        return best
+        slot = _VOICE_SLOT.get(voice)
+        if slot:
+            gender, position = slot
+            heap = self._usage_heaps[gender]
+            heapq.heappush(heap, (usage, position, voice))
+            # Stale entries pile up when counts drop; rebuild before they dominate
+            if len(heap) > 4 * len(_GENDER_VOICES[gender]):
+                self._rebuild_usage_heaps()
+    
+    def _rebuild_usage_heaps(self):
+        """Rebuild the per-gender usage heaps from _voice_usage_count"""
+        for gender, voices in _GENDER_VOICES.items():
+            heap = [(self._voice_usage_count.get(voice, 0), i, voice) for i, voice in enumerate(voices)]
+            heapq.heapify(heap)
+            self._usage_heaps[gender] = heap
     
     def _save_fingerprint(self, fingerprint: NPCVoiceFingerprint):
         """Save fingerprint to database"""
-        conn = sqlite3.connect(VOICE_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO voice_fingerprints 
-            (npc_id, base_voice_key, stability_mod, similarity_mod, style_mod, speed_mod, pitch_description)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            fingerprint.npc_id, fingerprint.base_voice_key,
-            fingerprint.stability_mod, fingerprint.similarity_mod,
-            fingerprint.style_mod, fingerprint.speed_mod, fingerprint.pitch_description
-        ))
-        conn.commit()
-        conn.close()
+        with self._db_lock:
+            self._cursor.execute(_INSERT_FINGERPRINT_SQL, _fingerprint_row(fingerprint))
     
     def get_npc_voice_info(self, npc_id: str) -> Optional[Dict]:
-        """Get complete voice information for an NPC"""
+        """Get complete voice information for an NPC
+        
+        Built once per assignment; the returned dict is shared, so treat it
+        as read-only.
+        """
+        info = self._voice_info_cache.get(npc_id)
+        if info is None:
+            info = self._build_voice_info(npc_id)
+            if info is not None:
+                self._voice_info_cache[npc_id] = info
+        return info
+    
+    def _build_voice_info(self, npc_id: str) -> Optional[Dict]:
+        """Assemble voice information for an NPC from its cloned voice or fingerprint"""
         if npc_id in self._cloned_voices:
             cloned = self._cloned_voices[npc_id]
             return {
@@ -505,7 +764,8 @@ class NPCVoiceSystem:
         text: str,
         mood: str = "neutral",
         role: str = "citizen",
-        personality: Dict = None
+        personality: Dict = None,
+        audio_format: str = DEFAULT_AUDIO_FORMAT
     ) -> Optional[bytes]:
         """
         Generate speech with unique voice fingerprint and mood adjustments.
@@ -513,6 +773,95 @@ class NPCVoiceSystem:
         if not self.client:
             return None
         
+        request = self._speech_request(npc_id, text, mood, role, personality, audio_format)
+        if not request:
+            return None
+        cache_key, voice_id, settings = request
+        
+        cached = self._get_cached_audio(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Generate audio with Turbo model for faster response
+            audio_generator = self.client.text_to_speech.convert(
+                text=text,
+                voice_id=voice_id,
+                model_id=TTS_MODEL_ID,
+                voice_settings=VoiceSettings(**settings),
+                output_format=audio_format
+            )
+            
+            # Collect audio bytes (one join instead of repeated bytes concatenation)
+            audio_data = b"".join(audio_generator)
+            
+        except Exception as e:
+            print(f"Voice generation error for {npc_id}: {e}")
+            return None
+        
+        if audio_data:
+            self._cache_audio(cache_key, audio_data)
+        return audio_data
+    
+    async def generate_speech_async(
+        self,
+        npc_id: str,
+        text: str,
+        mood: str = "neutral",
+        role: str = "citizen",
+        personality: Dict = None,
+        audio_format: str = DEFAULT_AUDIO_FORMAT
+    ) -> Optional[bytes]:
+        """Async version of speech generation (streams on the event loop, no worker thread)"""
+        if not self.async_client:
+            return None
+        
+        request = self._speech_request(npc_id, text, mood, role, personality, audio_format)
+        if not request:
+            return None
+        cache_key, voice_id, settings = request
+        
+        # Only the disk layer blocks; memory hits stay on the loop
+        if self._audio_cache_dir is None:
+            cached = self._get_cached_audio(cache_key)
+        else:
+            cached = await asyncio.to_thread(self._get_cached_audio, cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            buffer = io.BytesIO()
+            async for chunk in self.async_client.text_to_speech.convert(
+                text=text,
+                voice_id=voice_id,
+                model_id=TTS_MODEL_ID,
+                voice_settings=VoiceSettings(**settings),
+                output_format=audio_format
+            ):
+                buffer.write(chunk)
+            audio_data = buffer.getvalue()
+            
+        except Exception as e:
+            print(f"Voice generation error for {npc_id}: {e}")
+            return None
+        
+        if audio_data:
+            if self._audio_cache_dir is None:
+                self._cache_audio(cache_key, audio_data)
+            else:
+                await asyncio.to_thread(self._cache_audio, cache_key, audio_data)
+        return audio_data
+    
+    def _speech_request(
+        self,
+        npc_id: str,
+        text: str,
+        mood: str,
+        role: str,
+        personality: Optional[Dict],
+        audio_format: str
+    ) -> Optional[Tuple[str, str, Dict]]:
+        """(cache key, voice_id, VoiceSettings kwargs) for an utterance, or None if no voice"""
         # Get or create voice info
         voice_info = self.get_npc_voice_info(npc_id)
         
@@ -535,82 +884,137 @@ class NPCVoiceSystem:
         final_stability = max(0.1, min(1.0, base_stability + mood_adj["stability"]))
         final_style = max(0.0, min(1.0, base_style + mood_adj["style"]))
         
+        # Same voice, settings and line -> same audio; skip the API round trip
+        cache_key = hashlib.sha256(
+            f"{TTS_MODEL_ID}|{audio_format}|{voice_info['voice_id']}|{final_stability!r}|{base_similarity!r}|{final_style!r}|{text}".encode()
+        ).hexdigest()
+        
+        settings = {
+            "stability": final_stability,
+            "similarity_boost": base_similarity,
+            "style": final_style,
+            "use_speaker_boost": True
+        }
+        return cache_key, voice_info["voice_id"], settings
+    
+    def _audio_cache_path(self, cache_key: str) -> Path:
+        """On-disk location of a cached clip (sharded by the first two hex digits)"""
+        return self._audio_cache_dir / cache_key[:2] / f"{cache_key}.audio"
+    
+    def _get_cached_audio(self, cache_key: str) -> Optional[bytes]:
+        """Look up a generated clip in memory, then on disk"""
+        with self._audio_cache_lock:
+            audio = self._audio_cache.get(cache_key)
+            if audio is not None:
+                self._audio_cache.move_to_end(cache_key)
+                return audio
+        
+        if self._audio_cache_dir is None:
+            return None
+        path = self._audio_cache_path(cache_key)
         try:
-            voice_settings = VoiceSettings(
-                stability=final_stability,
-                similarity_boost=base_similarity,
-                style=final_style,
-                use_speaker_boost=True
-            )
-            
-            # Generate audio with Turbo model for faster response
-            audio_generator = self.client.text_to_speech.convert(
-                text=text,
-                voice_id=voice_info["voice_id"],
-                model_id="eleven_turbo_v2_5",  # ~2x faster than multilingual
-                voice_settings=voice_settings
-            )
-            
-            # Collect audio bytes
-            audio_data = b""
-            for chunk in audio_generator:
-                audio_data += chunk
-            
-            return audio_data
-            
-        except Exception as e:
-            print(f"Voice generation error for {npc_id}: {e}")
+            audio = path.read_bytes()
+            os.utime(path)  # mtime is the disk layer's LRU clock
+        except OSError:
             return None
+        self._remember_audio(cache_key, audio)
+        return audio
     
-    async def generate_speech_async(
-        self,
-        npc_id: str,
-        text: str,
-        mood: str = "neutral",
-        role: str = "citizen",
-        personality: Dict = None
-    ) -> Optional[bytes]:
-        """Async version of speech generation"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, self.generate_speech, npc_id, text, mood, role, personality
-        )
+    def _cache_audio(self, cache_key: str, audio: bytes):
+        """Store a generated clip in memory and, if enabled, on disk"""
+        self._remember_audio(cache_key, audio)
+        if self._audio_cache_dir is None:
+            return
+        
+        path = self._audio_cache_path(cache_key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠ Audio cache write failed: {e}")
+            return
+        
+        with self._disk_cache_lock:
+            if self._disk_cache_bytes is None:
+                self._disk_cache_bytes = sum(size for _, size, _ in self._disk_cache_files())
+            else:
+                self._disk_cache_bytes += len(audio)
+            if self._disk_cache_bytes > VOICE_AUDIO_CACHE_MAX_BYTES:
+                self._prune_disk_cache()
+    
+    def _disk_cache_files(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, size, path) of every clip in the disk cache"""
+        files = []
+        for path in self._audio_cache_dir.glob("*/*.audio"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+    
+    def _prune_disk_cache(self):
+        """Delete least recently used clips until the disk cache is back under
+        90% of VOICE_AUDIO_CACHE_MAX_BYTES (caller holds _disk_cache_lock)"""
+        files = sorted(self._disk_cache_files())
+        total = sum(size for _, size, _ in files)
+        target = VOICE_AUDIO_CACHE_MAX_BYTES * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._disk_cache_bytes = total
+    
+    def _remember_audio(self, cache_key: str, audio: bytes):
+        """Insert into the in-memory LRU, evicting the oldest clips past AUDIO_CACHE_BYTES"""
+        if len(audio) > self.AUDIO_CACHE_BYTES:
+            return
+        with self._audio_cache_lock:
+            previous = self._audio_cache.pop(cache_key, None)
+            if previous is not None:
+                self._audio_cache_bytes -= len(previous)
+            self._audio_cache[cache_key] = audio
+            self._audio_cache_bytes += len(audio)
+            while self._audio_cache_bytes > self.AUDIO_CACHE_BYTES:
+                _, evicted = self._audio_cache.popitem(last=False)
+                self._audio_cache_bytes -= len(evicted)
     
     async def generate_voice_async(
         self,
         npc_id: str,
         text: str,
         mood: str = "neutral",
-        output_format: str = "mp3"
+        output_format: str = "mp3",
+        encode_base64: bool = True
     ) -> Optional[Dict]:
         """
         Generate voice audio for conversation system.
-        Returns dict with audio base64, format, and metadata.
+        Returns dict with audio base64, format, and metadata; with
+        encode_base64=False "audio" holds the raw bytes (for binary transports).
         """
-        # Generate raw audio
-        audio_bytes = await self.generate_speech_async(npc_id, text, mood)
+        # WAV is requested from ElevenLabs as raw PCM and only needs a header
+        want_wav = output_format.lower() == "wav"
+        audio_bytes = await self.generate_speech_async(
+            npc_id, text, mood, audio_format=WAV_PCM_FORMAT if want_wav else DEFAULT_AUDIO_FORMAT
+        )
         
         if not audio_bytes:
             return None
         
-        # Convert to requested format if needed
-        if output_format.lower() == "wav" and audio_bytes:
-            try:
-                from pydub import AudioSegment
-                # ElevenLabs returns MP3
-                audio_segment = AudioSegment.from_mp3(io.BytesIO(audio_bytes))
-                wav_buffer = io.BytesIO()
-                audio_segment.export(wav_buffer, format="wav")
-                audio_bytes = wav_buffer.getvalue()
-            except Exception as e:
-                print(f"WAV conversion error: {e}")
-                output_format = "mp3"  # Fall back to MP3
+        if want_wav:
+            audio_bytes = pcm_to_wav(audio_bytes, WAV_SAMPLE_RATE)
         
         # Get voice info for metadata
         voice_info = self.get_npc_voice_info(npc_id)
         
         return {
-            "audio": base64.b64encode(audio_bytes).decode('utf-8'),
+            "audio": base64.b64encode(audio_bytes).decode('utf-8') if encode_base64 else audio_bytes,
             "format": output_format,
             "voice_id": voice_info.get("voice_id", "") if voice_info else "",
             "voice_name": voice_info.get("voice_name", "") if voice_info else "",
@@ -672,6 +1076,7 @@ class NPCVoiceSystem:
             
             # Store
             self._cloned_voices[npc_id] = profile
+            self._voice_info_cache.pop(npc_id, None)
             self._save_cloned_voice(npc_id, profile)
             
             print(f"✓ Voice cloned for NPC {npc_id}: {voice_name}")
@@ -683,15 +1088,9 @@ class NPCVoiceSystem:
     
     def _save_cloned_voice(self, npc_id: str, profile: VoiceProfile):
         """Save cloned voice to database"""
-        conn = sqlite3.connect(VOICE_DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO cloned_voices 
-            (npc_id, voice_id, voice_name, description)
-            VALUES (?, ?, ?, ?)
-        """, (npc_id, profile.voice_id, profile.voice_name, profile.description))
-        conn.commit()
-        conn.close()
+        with self._db_lock:
+            self._cursor.execute(_INSERT_CLONED_VOICE_SQL,
+                                 (npc_id, profile.voice_id, profile.voice_name, profile.description))
     
     def delete_cloned_voice(self, npc_id: str) -> bool:
         """Delete a cloned voice"""
@@ -705,13 +1104,11 @@ class NPCVoiceSystem:
             
             # Remove from local storage
             del self._cloned_voices[npc_id]
+            self._voice_info_cache.pop(npc_id, None)
             
             # Remove from database
-            conn = sqlite3.connect(VOICE_DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM cloned_voices WHERE npc_id = ?", (npc_id,))
-            conn.commit()
-            conn.close()
+            with self._db_lock:
+                self._cursor.execute("DELETE FROM cloned_voices WHERE npc_id = ?", (npc_id,))
             
             return True
         except Exception as e:
@@ -754,7 +1151,7 @@ class NPCVoiceSystem:
         """Get all NPC voice assignments with full details"""
         assignments = {}
         
-        for npc_id in set(list(self._voice_fingerprints.keys()) + list(self._cloned_voices.keys())):
+        for npc_id in self._voice_fingerprints.keys() | self._cloned_voices.keys():
             info = self.get_npc_voice_info(npc_id)
             if info:
                 assignments[npc_id] = info
@@ -809,20 +1206,16 @@ class NPCVoiceSystem:
             fingerprint = self._voice_fingerprints[npc_id]
             # Decrease usage count
             if fingerprint.base_voice_key in self._voice_usage_count:
-                self._voice_usage_count[fingerprint.base_voice_key] -= 1
-                if self._voice_usage_count[fingerprint.base_voice_key] <= 0:
-                    del self._voice_usage_count[fingerprint.base_voice_key]
+                self._bump_usage(fingerprint.base_voice_key, -1)
             
             # Remove from memory
             del self._voice_fingerprints[npc_id]
+            self._voice_info_cache.pop(npc_id, None)
             
             # Remove from database
             try:
-                conn = sqlite3.connect(VOICE_DB_PATH)
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM voice_fingerprints WHERE npc_id = ?", (npc_id,))
-                conn.commit()
-                conn.close()
+                with self._db_lock:
+                    self._cursor.execute("DELETE FROM voice_fingerprints WHERE npc_id = ?", (npc_id,))
             except Exception as e:
                 print(f"Error removing voice from DB: {e}")
             
@@ -836,20 +1229,30 @@ class NPCVoiceSystem:
         """
         count = len(self._voice_fingerprints)
         self._voice_fingerprints.clear()
+        self._voice_info_cache.clear()
         self._voice_usage_count.clear()
+        self._rebuild_usage_heaps()
         
         try:
-            conn = sqlite3.connect(VOICE_DB_PATH)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM voice_fingerprints")
-            conn.commit()
-            conn.close()
+            with self._db_lock:
+                self._cursor.execute("DELETE FROM voice_fingerprints")
         except Exception as e:
             print(f"Error clearing voice DB: {e}")
         
         return {"cleared": count}
 
 
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV header"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
 # ============================================================================
 # Global Instance
 # ============================================================================
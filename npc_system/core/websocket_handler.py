@@ -6,7 +6,7 @@ Supports: NPC interaction, voice streaming, world events, faction updates
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, Set, Optional, Any
 import asyncio
-import json
+import orjson
 import base64
 import logging
 import time
@@ -15,6 +15,23 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Enums serialize by value; numpy scalars/arrays can come out of the simulation systems
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _encode_message(message: dict) -> str:
+    """Serialize an outgoing message to a text frame payload"""
+    return orjson.dumps(message, option=_ORJSON_OPTS).decode()
+
+
+def _mp3_to_wav(audio_bytes: bytes) -> bytes:
+    """Decode MP3 to WAV with pydub (blocking - run it in a worker thread)"""
+    import io
+    from pydub import AudioSegment
+    wav_buffer = io.BytesIO()
+    AudioSegment.from_mp3(io.BytesIO(audio_bytes)).export(wav_buffer, format="wav")
+    return wav_buffer.getvalue()
+
 
 class MessageType(str, Enum):
     # Client -> Server
@@ -46,6 +63,7 @@ class MessageType(str, Enum):
     NPC_RESPONSE = "npc_response"
     NPC_STATUS_RESPONSE = "npc_status_response"
     VOICE_CHUNK = "voice_chunk"
+    VOICE_CHUNK_BIN = "voice_chunk_bin"  # header; audio follows as binary frames
     VOICE_COMPLETE = "voice_complete"
     TRANSCRIPTION = "transcription"
     WORLD_EVENT = "world_event"
@@ -77,18 +95,50 @@ class GameClient:
     last_ping: float = field(default_factory=time.time)
 
 
+@dataclass
+class NPCInstanceView:
+    """Persona fields the handlers read per message, normalized once per NPC instance"""
+    npc: Any
+    name: str
+    role: Optional[str]
+    personality: dict
+    
+    @classmethod
+    def from_npc(cls, npc_id: str, npc) -> "NPCInstanceView":
+        """Accept dict personas as well as attribute-style ones"""
+        persona = getattr(npc, 'persona', {})
+        if isinstance(persona, dict):
+            name = persona.get('name', npc_id)
+            role = persona.get('role')
+            personality = persona.get('personality', {})
+        else:
+            name = npc_id
+            role = getattr(persona, 'role', None)
+            personality = getattr(persona, 'personality', {})
+        
+        if hasattr(personality, '__dict__'):
+            personality = vars(personality)
+        return cls(npc=npc, name=name, role=role, personality=personality)
+
+
 class WebSocketManager:
     """Manages WebSocket connections and message routing"""
     
+    # Broadcast fan-out: cap on in-flight sends, and how long one client may stall
+    MAX_CONCURRENT_SENDS = 256
+    SEND_TIMEOUT = 5.0
+    # Streams yield to the event loop every N chunks so one long send can't starve other clients
+    STREAM_YIELD_EVERY = 8
+    
     def __init__(self):
         self.active_connections: Dict[str, GameClient] = {}
-        self.event_subscribers: Dict[str, Set[str]] = {
-            "world_events": set(),
-            "faction_updates": set(),
-            "territory_updates": set(),
-            "quest_updates": set(),
+        # event type -> {player_id: client}; each client also lists its own event types
+        self.event_subscribers: Dict[str, Dict[str, GameClient]] = {
+            "world_events": {},
+            "faction_updates": {},
+            "territory_updates": {},
+            "quest_updates": {},
         }
-        self._broadcast_lock = asyncio.Lock()
     
     async def connect(self, websocket: WebSocket, player_id: str, player_name: str = "Unknown") -> GameClient:
         """Accept a new WebSocket connection"""
@@ -98,27 +148,43 @@ class WebSocketManager:
             player_id=player_id,
             player_name=player_name
         )
+        previous = self.active_connections.get(player_id)
+        if previous is not None:
+            # Reconnect: keep the player's subscriptions, pointed at the new socket
+            client.subscriptions = previous.subscriptions
+            for event_type in client.subscriptions:
+                self.event_subscribers[event_type][player_id] = client
         self.active_connections[player_id] = client
         logger.info(f"WebSocket connected: {player_id} ({player_name})")
         return client
     
     def disconnect(self, player_id: str):
         """Remove a WebSocket connection"""
-        if player_id in self.active_connections:
-            # Remove from all subscriptions
-            for sub_set in self.event_subscribers.values():
-                sub_set.discard(player_id)
-            del self.active_connections[player_id]
+        client = self.active_connections.pop(player_id, None)
+        if client is not None:
+            # Only the client's own subscriptions need touching
+            for event_type in client.subscriptions:
+                self.event_subscribers[event_type].pop(player_id, None)
             logger.info(f"WebSocket disconnected: {player_id}")
     
+    async def send_raw(self, player_id: str, data):
+        """Send an already-serialized frame (str -> text frame, bytes -> binary frame)"""
+        client = self.active_connections.get(player_id)
+        if client is None:
+            return
+        try:
+            if isinstance(data, str):
+                await client.websocket.send_text(data)
+            else:
+                await client.websocket.send_bytes(data)
+        except Exception as e:
+            logger.error(f"Error sending to {player_id}: {e}")
+            self.disconnect(player_id)
+    
     async def send_message(self, player_id: str, message: dict):
         """Send a message to a specific client"""
         if player_id in self.active_connections:
-            try:
-                await self.active_connections[player_id].websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to {player_id}: {e}")
-                self.disconnect(player_id)
+            await self.send_raw(player_id, _encode_message(message))
     
     async def send_error(self, player_id: str, error: str, request_id: str = None):
         """Send an error message to a client"""
@@ -132,24 +198,50 @@ class WebSocketManager:
         await self.send_message(player_id, msg)
     
     async def broadcast(self, event_type: str, message: dict):
-        """Broadcast a message to all subscribers of an event type"""
-        async with self._broadcast_lock:
-            subscribers = self.event_subscribers.get(event_type, set()).copy()
-            for player_id in subscribers:
-                await self.send_message(player_id, message)
+        """Broadcast a message to all subscribers of an event type
+        
+        Sends run concurrently, so one slow client no longer delays the rest;
+        clients whose send fails or times out are disconnected afterwards.
+        """
+        subscribers = self.event_subscribers.get(event_type)
+        if not subscribers:
+            return
+        
+        # Serialized once and shared by every subscriber's send
+        payload = _encode_message(message)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
+        
+        async def _safe_send(client: GameClient):
+            async with semaphore:
+                # May have disconnected (or reconnected) while waiting for a slot
+                if self.active_connections.get(client.player_id) is not client:
+                    return client, True
+                try:
+                    await asyncio.wait_for(client.websocket.send_text(payload), timeout=self.SEND_TIMEOUT)
+                    return client, True
+                except Exception as e:
+                    logger.error(f"Error sending to {client.player_id}: {e!r}")
+                    return client, False
+        
+        # gather() unpacks the generator before its first await, so the live
+        # subscriber dict can't change underneath it - no snapshot copy needed
+        results = await asyncio.gather(*(_safe_send(client) for client in subscribers.values()))
+        for client, ok in results:
+            if not ok and self.active_connections.get(client.player_id) is client:
+                self.disconnect(client.player_id)
     
     def subscribe(self, player_id: str, event_type: str):
         """Subscribe a client to an event type"""
-        if event_type in self.event_subscribers:
-            self.event_subscribers[event_type].add(player_id)
-            if player_id in self.active_connections:
-                self.active_connections[player_id].subscriptions.add(event_type)
+        client = self.active_connections.get(player_id)
+        if event_type in self.event_subscribers and client is not None:
+            self.event_subscribers[event_type][player_id] = client
+            client.subscriptions.add(event_type)
             logger.info(f"{player_id} subscribed to {event_type}")
     
     def unsubscribe(self, player_id: str, event_type: str):
         """Unsubscribe a client from an event type"""
         if event_type in self.event_subscribers:
-            self.event_subscribers[event_type].discard(player_id)
+            self.event_subscribers[event_type].pop(player_id, None)
             if player_id in self.active_connections:
                 self.active_connections[player_id].subscriptions.discard(event_type)
             logger.info(f"{player_id} unsubscribed from {event_type}")
@@ -170,6 +262,29 @@ ws_manager = WebSocketManager()
 class WebSocketHandler:
     """Handles WebSocket message processing"""
     
+    # Message type -> handler method name (bound once per handler in __init__)
+    _HANDLERS: Dict[str, str] = {
+        MessageType.PING.value: "_handle_ping",
+        MessageType.NPC_INIT.value: "_handle_npc_init",
+        MessageType.NPC_ACTION.value: "_handle_npc_action",
+        MessageType.NPC_STATUS.value: "_handle_npc_status",
+        MessageType.VOICE_GENERATE.value: "_handle_voice_generate",
+        MessageType.SPEECH_TRANSCRIBE.value: "_handle_speech_transcribe",
+        MessageType.SUBSCRIBE_EVENTS.value: "_handle_subscribe",
+        MessageType.UNSUBSCRIBE_EVENTS.value: "_handle_unsubscribe",
+        MessageType.GET_FACTIONS.value: "_handle_get_factions",
+        MessageType.GET_WORLD_EVENTS.value: "_handle_get_world_events",
+        # Conversation groups
+        MessageType.UPDATE_LOCATION.value: "_handle_update_location",
+        MessageType.GET_NEARBY_NPCS.value: "_handle_get_nearby_npcs",
+        MessageType.START_CONVERSATION.value: "_handle_start_conversation",
+        MessageType.CONVERSATION_MESSAGE.value: "_handle_conversation_message",
+        MessageType.ADD_NPC_TO_CONVERSATION.value: "_handle_add_npc_to_conversation",
+        MessageType.REMOVE_NPC_FROM_CONVERSATION.value: "_handle_remove_npc_from_conversation",
+        MessageType.END_CONVERSATION.value: "_handle_end_conversation",
+        MessageType.GET_CONVERSATION.value: "_handle_get_conversation",
+    }
+    
     def __init__(self, npc_instances: dict, npc_voice_system, stt_client, 
                  world_simulator, faction_system, territory_system, quest_generator,
                  conversation_manager=None):
@@ -181,6 +296,8 @@ class WebSocketHandler:
         self.territory_system = territory_system
         self.quest_generator = quest_generator
         self.conversation_manager = conversation_manager
+        self._handlers = {msg_type: getattr(self, name) for msg_type, name in self._HANDLERS.items()}
+        self._npc_views: Dict[str, NPCInstanceView] = {}
     
     def set_conversation_manager(self, conversation_manager):
         """Set conversation manager reference"""
@@ -188,34 +305,33 @@ class WebSocketHandler:
         if conversation_manager:
             conversation_manager.set_npc_instances(self.npc_instances)
     
+    def _npc_view(self, npc_id: str) -> Optional[NPCInstanceView]:
+        """Cached persona view; rebuilt automatically if the NPC instance was replaced"""
+        npc = self.npc_instances.get(npc_id)
+        if npc is None:
+            return None
+        view = self._npc_views.get(npc_id)
+        if view is None or view.npc is not npc:
+            view = self._npc_views[npc_id] = NPCInstanceView.from_npc(npc_id, npc)
+        return view
+    
+    def invalidate_npc_view(self, npc_id: str = None):
+        """Drop cached persona views after a persona is edited in place (all if npc_id is None)"""
+        if npc_id is None:
+            self._npc_views.clear()
+        else:
+            self._npc_views.pop(npc_id, None)
+    
     async def handle_message(self, client: GameClient, message: dict) -> Optional[dict]:
         """Route and handle incoming WebSocket messages"""
-        msg_type = message.get("type", "").lower()
+        msg_type = message.get("type", "")
         request_id = message.get("request_id")
         
-        handlers = {
-            MessageType.PING: self._handle_ping,
-            MessageType.NPC_INIT: self._handle_npc_init,
-            MessageType.NPC_ACTION: self._handle_npc_action,
-            MessageType.NPC_STATUS: self._handle_npc_status,
-            MessageType.VOICE_GENERATE: self._handle_voice_generate,
-            MessageType.SPEECH_TRANSCRIBE: self._handle_speech_transcribe,
-            MessageType.SUBSCRIBE_EVENTS: self._handle_subscribe,
-            MessageType.UNSUBSCRIBE_EVENTS: self._handle_unsubscribe,
-            MessageType.GET_FACTIONS: self._handle_get_factions,
-            MessageType.GET_WORLD_EVENTS: self._handle_get_world_events,
-            # Conversation groups
-            MessageType.UPDATE_LOCATION: self._handle_update_location,
-            MessageType.GET_NEARBY_NPCS: self._handle_get_nearby_npcs,
-            MessageType.START_CONVERSATION: self._handle_start_conversation,
-            MessageType.CONVERSATION_MESSAGE: self._handle_conversation_message,
-            MessageType.ADD_NPC_TO_CONVERSATION: self._handle_add_npc_to_conversation,
-            MessageType.REMOVE_NPC_FROM_CONVERSATION: self._handle_remove_npc_from_conversation,
-            MessageType.END_CONVERSATION: self._handle_end_conversation,
-            MessageType.GET_CONVERSATION: self._handle_get_conversation,
-        }
-        
-        handler = handlers.get(msg_type)
+        handler = self._handlers.get(msg_type)
+        if handler is None and isinstance(msg_type, str):
+            # Types are lowercase; only pay for .lower() on a miss
+            msg_type = msg_type.lower()
+            handler = self._handlers.get(msg_type)
         if handler:
             try:
                 response = await handler(client, message)
@@ -337,75 +453,101 @@ class WebSocketHandler:
         mood = message.get("mood", "neutral")
         audio_format = message.get("format", "wav")
         request_id = message.get("request_id")
+        binary = message.get("binary", False)
         
         if not npc_id or not text:
             await ws_manager.send_error(client.player_id, "npc_id and text required", request_id)
             return
         
-        if npc_id not in self.npc_instances:
+        view = self._npc_view(npc_id)
+        if view is None:
             await ws_manager.send_error(client.player_id, f"NPC {npc_id} not initialized", request_id)
             return
         
-        npc = self.npc_instances[npc_id]
-        persona = npc.persona if hasattr(npc, 'persona') else {}
-        
-        if isinstance(persona, dict):
-            role = persona.get('role', 'citizen')
-            personality = persona.get('personality', {})
-        else:
-            role = getattr(persona, 'role', 'citizen')
-            personality = getattr(persona, 'personality', {})
-        
-        if hasattr(personality, '__dict__'):
-            personality = vars(personality)
+        role = view.role or 'citizen'
+        personality = view.personality
         
         try:
-            # Generate audio
-            audio_bytes = await self.voice_system.generate_speech_async(
-                npc_id=npc_id,
-                text=text,
-                mood=mood,
-                role=role,
-                personality=personality
-            )
+            want_wav = audio_format.lower() == "wav"
+            audio_bytes = None
             
-            if not audio_bytes:
-                await ws_manager.send_error(client.player_id, "Voice generation failed", request_id)
-                return
+            if want_wav:
+                # Ask for raw PCM and just add a WAV header - no MP3 decode at all
+                from core.voice_system import WAV_PCM_FORMAT, WAV_SAMPLE_RATE, pcm_to_wav
+                pcm = await self.voice_system.generate_speech_async(
+                    npc_id=npc_id,
+                    text=text,
+                    mood=mood,
+                    role=role,
+                    personality=personality,
+                    audio_format=WAV_PCM_FORMAT
+                )
+                if pcm:
+                    audio_bytes = pcm_to_wav(pcm, WAV_SAMPLE_RATE)
             
-            # Convert to WAV if requested
-            if audio_format.lower() == "wav":
-                try:
-                    import io
-                    from pydub import AudioSegment
-                    mp3_audio = AudioSegment.from_mp3(io.BytesIO(audio_bytes))
-                    wav_buffer = io.BytesIO()
-                    mp3_audio.export(wav_buffer, format="wav")
-                    audio_bytes = wav_buffer.getvalue()
-                except Exception as e:
-                    logger.warning(f"WAV conversion failed, using MP3: {e}")
-                    audio_format = "mp3"
+            if not audio_bytes:
+                # Generate audio
+                audio_bytes = await self.voice_system.generate_speech_async(
+                    npc_id=npc_id,
+                    text=text,
+                    mood=mood,
+                    role=role,
+                    personality=personality
+                )
+                
+                if not audio_bytes:
+                    await ws_manager.send_error(client.player_id, "Voice generation failed", request_id)
+                    return
+                
+                # PCM wasn't available - convert the MP3 off the event loop
+                if want_wav:
+                    try:
+                        audio_bytes = await asyncio.to_thread(_mp3_to_wav, audio_bytes)
+                    except Exception as e:
+                        logger.warning(f"WAV conversion failed, using MP3: {e}")
+                        audio_format = "mp3"
             
             # Stream audio in chunks (16KB chunks for smooth streaming)
             chunk_size = 16384
             total_chunks = (len(audio_bytes) + chunk_size - 1) // chunk_size
             
-            for i in range(0, len(audio_bytes), chunk_size):
-                chunk = audio_bytes[i:i + chunk_size]
-                chunk_b64 = base64.b64encode(chunk).decode('utf-8')
-                
+            if binary:
+                # Clients that opt in get one JSON header, then the raw audio as binary frames
                 await ws_manager.send_message(client.player_id, {
-                    "type": MessageType.VOICE_CHUNK,
+                    "type": MessageType.VOICE_CHUNK_BIN,
                     "npc_id": npc_id,
-                    "chunk_index": i // chunk_size,
                     "total_chunks": total_chunks,
-                    "audio_data": chunk_b64,
+                    "chunk_size": chunk_size,
+                    "total_size": len(audio_bytes),
                     "format": audio_format,
                     "request_id": request_id
                 })
+                audio_view = memoryview(audio_bytes)
+                for chunk_index, i in enumerate(range(0, len(audio_bytes), chunk_size), 1):
+                    await ws_manager.send_raw(client.player_id, bytes(audio_view[i:i + chunk_size]))
+                    if chunk_index % ws_manager.STREAM_YIELD_EVERY == 0:
+                        await asyncio.sleep(0)
+            else:
+                # Encode once, then cut the base64 on 4-char boundaries so every
+                # chunk still decodes on its own
+                encoded = memoryview(base64.b64encode(audio_bytes))
+                step = (chunk_size // 3) * 4
+                total_chunks = (len(encoded) + step - 1) // step
                 
-                # Small delay to prevent overwhelming the client
-                await asyncio.sleep(0.01)
+                for chunk_index, i in enumerate(range(0, len(encoded), step)):
+                    await ws_manager.send_message(client.player_id, {
+                        "type": MessageType.VOICE_CHUNK,
+                        "npc_id": npc_id,
+                        "chunk_index": chunk_index,
+                        "total_chunks": total_chunks,
+                        "audio_data": bytes(encoded[i:i + step]).decode('ascii'),
+                        "format": audio_format,
+                        "request_id": request_id
+                    })
+                    
+                    # The send itself applies backpressure; just yield now and then
+                    if (chunk_index + 1) % ws_manager.STREAM_YIELD_EVERY == 0:
+                        await asyncio.sleep(0)
             
             # Send completion message
             await ws_manager.send_message(client.player_id, {
@@ -430,9 +572,11 @@ class WebSocketHandler:
             return {"type": MessageType.ERROR, "error": "audio_base64 required"}
         
         try:
-            audio_bytes = base64.b64decode(audio_base64)
-            transcription = await self.stt_client.transcribe(
-                audio_bytes=audio_bytes,
+            # Multi-MB payloads would stall every other connection if decoded on the loop
+            audio_bytes = await asyncio.to_thread(base64.b64decode, audio_base64)
+            # Whisper call is network-bound; the async client keeps it off the loop too
+            transcription = await self.stt_client.transcribe_async(
+                audio_data=audio_bytes,
                 language=language
             )
             
@@ -552,17 +696,13 @@ class WebSocketHandler:
         # Get NPC details
         npc_details = []
         for npc_id in nearby:
-            if npc_id in self.npc_instances:
-                npc = self.npc_instances[npc_id]
-                persona = npc.persona if hasattr(npc, 'persona') else {}
-                name = persona.get("name", npc_id) if isinstance(persona, dict) else npc_id
-                role = persona.get("role", "Unknown") if isinstance(persona, dict) else "Unknown"
-                
+            view = self._npc_view(npc_id)
+            if view is not None:
                 loc = self.conversation_manager.npc_locations.get(npc_id)
                 npc_details.append({
                     "npc_id": npc_id,
-                    "name": name,
-                    "role": role,
+                    "name": view.name,
+                    "role": view.role or "Unknown",
                     "location": {
                         "x": loc.x if loc else 0,
                         "y": loc.y if loc else 0,
@@ -604,16 +744,12 @@ class WebSocketHandler:
             # Get participant details
             participants = []
             for npc_id, participant in group.participants.items():
-                if npc_id in self.npc_instances:
-                    npc = self.npc_instances[npc_id]
-                    persona = npc.persona if hasattr(npc, 'persona') else {}
-                    name = persona.get("name", npc_id) if isinstance(persona, dict) else npc_id
-                    role = persona.get("role", "Unknown") if isinstance(persona, dict) else "Unknown"
-                    
+                view = self._npc_view(npc_id)
+                if view is not None:
                     participants.append({
                         "npc_id": npc_id,
-                        "name": name,
-                        "role": role,
+                        "name": view.name,
+                        "role": view.role or "Unknown",
                         "mood": participant.mood
                     })
             
@@ -635,9 +771,11 @@ class WebSocketHandler:
         """
         Send a message in a group conversation.
         Message: { "type": "conversation_message", "group_id": "...", "message": "...", 
-                   "target_npc_id": "..." (optional), "with_voice": false, "voice_format": "wav" }
+                   "target_npc_id": "..." (optional), "with_voice": false, "voice_format": "wav",
+                   "binary": false }
         
         If with_voice=True, voice audio will be streamed separately for each NPC.
+        With binary=True the audio follows each chunk header as raw binary frames.
         """
         if not self.conversation_manager:
             return {"type": MessageType.ERROR, "error": "Conversation manager not initialized"}
@@ -647,6 +785,7 @@ class WebSocketHandler:
         target_npc_id = message.get("target_npc_id")
         with_voice = message.get("with_voice", False)
         voice_format = message.get("voice_format", "wav")
+        binary = message.get("binary", False)
         
         if not group_id or not text:
             return {"type": MessageType.ERROR, "error": "group_id and message required"}
@@ -692,7 +831,8 @@ class WebSocketHandler:
             if with_voice and responses:
                 voice_results = await self.conversation_manager.generate_voice_for_responses(
                     responses, 
-                    audio_format=voice_format
+                    audio_format=voice_format,
+                    encode_base64=False
                 )
                 
                 result["voice_count"] = len(voice_results)
@@ -705,51 +845,70 @@ class WebSocketHandler:
                 CHUNK_SIZE = 16 * 1024  # 16KB chunks
                 
                 for voice_idx, voice_resp in enumerate(voice_results):
-                    audio_b64 = voice_resp.get("audio_base64", "")
+                    audio_raw = voice_resp.get("audio_bytes")
                     
-                    if audio_b64:
-                        # Split audio into chunks
-                        chunks = [audio_b64[i:i+CHUNK_SIZE] for i in range(0, len(audio_b64), CHUNK_SIZE)]
-                        total_chunks = len(chunks)
-                        
-                        for chunk_idx, chunk in enumerate(chunks):
-                            await ws_manager.send_message(client.player_id, {
-                                "type": "conversation_voice_chunk",
-                                "group_id": group_id,
-                                "npc_id": voice_resp.get("npc_id"),
-                                "npc_name": voice_resp.get("npc_name"),
-                                "voice_index": voice_idx,
-                                "chunk_index": chunk_idx,
-                                "total_chunks": total_chunks,
-                                "audio_chunk": chunk,
-                                "format": voice_format,
-                                "timestamp": time.time()
-                            })
-                        
-                        # Send completion message for this NPC's voice
+                    if not audio_raw:
+                        # No audio - send error
                         await ws_manager.send_message(client.player_id, {
-                            "type": "conversation_voice_complete",
+                            "type": "conversation_voice_error",
                             "group_id": group_id,
                             "npc_id": voice_resp.get("npc_id"),
                             "npc_name": voice_resp.get("npc_name"),
-                            "voice_index": voice_idx,
-                            "dialogue": voice_resp.get("dialogue"),
-                            "response_type": voice_resp.get("response_type"),
-                            "mood": voice_resp.get("mood"),
-                            "format": voice_format,
-                            "total_chunks": total_chunks,
+                            "error": voice_resp.get("error", "No audio generated"),
                             "timestamp": time.time()
                         })
-                    else:
-                        # No audio - send error
+                        continue
+                    
+                    if binary:
+                        total_chunks = (len(audio_raw) + CHUNK_SIZE - 1) // CHUNK_SIZE
                         await ws_manager.send_message(client.player_id, {
-                            "type": "conversation_voice_error",
+                            "type": "conversation_voice_chunk_bin",
                             "group_id": group_id,
                             "npc_id": voice_resp.get("npc_id"),
                             "npc_name": voice_resp.get("npc_name"),
-                            "error": voice_resp.get("error", "No audio generated"),
+                            "voice_index": voice_idx,
+                            "total_chunks": total_chunks,
+                            "chunk_size": CHUNK_SIZE,
+                            "total_size": len(audio_raw),
+                            "format": voice_format,
                             "timestamp": time.time()
                         })
+                        audio_view = memoryview(audio_raw)
+                        for i in range(0, len(audio_raw), CHUNK_SIZE):
+                            await ws_manager.send_raw(client.player_id, bytes(audio_view[i:i + CHUNK_SIZE]))
+                    else:
+                        # Encode once and split the base64 into views (CHUNK_SIZE is a multiple of 4)
+                        encoded = memoryview(base64.b64encode(audio_raw))
+                        total_chunks = (len(encoded) + CHUNK_SIZE - 1) // CHUNK_SIZE
+                        
+                        for chunk_idx, i in enumerate(range(0, len(encoded), CHUNK_SIZE)):
+                            await ws_manager.send_message(client.player_id, {
+                                "type": "conversation_voice_chunk",
+                                "group_id": group_id,
+                                "npc_id": voice_resp.get("npc_id"),
+                                "npc_name": voice_resp.get("npc_name"),
+                                "voice_index": voice_idx,
+                                "chunk_index": chunk_idx,
+                                "total_chunks": total_chunks,
+                                "audio_chunk": bytes(encoded[i:i + CHUNK_SIZE]).decode('ascii'),
+                                "format": voice_format,
+                                "timestamp": time.time()
+                            })
+                    
+                    # Send completion message for this NPC's voice
+                    await ws_manager.send_message(client.player_id, {
+                        "type": "conversation_voice_complete",
+                        "group_id": group_id,
+                        "npc_id": voice_resp.get("npc_id"),
+                        "npc_name": voice_resp.get("npc_name"),
+                        "voice_index": voice_idx,
+                        "dialogue": voice_resp.get("dialogue"),
+                        "response_type": voice_resp.get("response_type"),
+                        "mood": voice_resp.get("mood"),
+                        "format": voice_format,
+                        "total_chunks": total_chunks,
+                        "timestamp": time.time()
+                    })
                 
                 # Return None since we already sent the response
                 return None
@@ -4,7 +4,10 @@ import asyncio
 from datetime import datetime
 from typing import List
 from dataclasses import dataclass
+import atexit
 import threading
+import queue
+import time
 import math
 import os
 from pathlib import Path
@@ -37,6 +40,89 @@ class TraitChange:
     timestamp: str
     current_value: float
 
+_INSERT_MEMORY_SQL = """INSERT OR REPLACE INTO memories 
+    (id, npc_id, memory_type, content, strength, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)"""
+
+# Write-behind batching shared by every vault: one queue of (db_path, row) and
+# one writer thread, flushed after this many rows or this long idle
+WRITE_BATCH = 32
+WRITE_INTERVAL = 0.05
+_write_q: queue.SimpleQueue = queue.SimpleQueue()
+_writer = None  # Started on first save_memory_async
+_writer_lock = threading.Lock()
+
+
+def _write_memory_rows(db_path: str, rows: List[tuple]):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.executemany(_INSERT_MEMORY_SQL, rows)
+    conn.commit()
+    conn.close()
+
+
+def _flush_batches(batches: dict):
+    for db_path, rows in batches.items():
+        try:
+            _write_memory_rows(db_path, rows)
+        except sqlite3.Error as e:
+            print(f"⚠ Memory write-behind error: {e}")
+    batches.clear()
+
+
+def _writer_loop():
+    """Write queued memories once WRITE_BATCH are buffered or WRITE_INTERVAL
+    after the first of them arrived, whichever comes first"""
+    batches: dict = {}
+    pending = 0
+    deadline = None
+    while True:
+        try:
+            if deadline is None:
+                item = _write_q.get()  # Nothing buffered: sleep until a write
+            else:
+                item = _write_q.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            item = None
+        if isinstance(item, tuple):
+            db_path, row = item
+            batches.setdefault(db_path, []).append(row)
+            pending += 1
+            if deadline is None:
+                deadline = time.monotonic() + WRITE_INTERVAL
+            if pending < WRITE_BATCH and time.monotonic() < deadline:
+                continue
+        if batches:
+            _flush_batches(batches)
+            pending = 0
+        deadline = None
+        if item is not None and not isinstance(item, tuple):
+            item.set()  # flush marker: everything queued before it is written
+
+
+def _enqueue_memory(db_path: str, row: tuple):
+    global _writer
+    _write_q.put_nowait((db_path, row))
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_writer_loop, name="memory-writer", daemon=True)
+                _writer.start()
+
+
+def flush_pending_memories(timeout: float = 5.0):
+    """Block until every queued memory (all vaults) is written - call on shutdown"""
+    if _writer is None:
+        return
+    done = threading.Event()
+    _write_q.put_nowait(done)
+    done.wait(timeout)
+
+
+# Fallback for exits that skip the service shutdown hook
+atexit.register(flush_pending_memories)
+
+
 class MemoryVault:
     def __init__(self, db_path: str = None):
         self.db_path = db_path or get_default_db_path()
@@ -95,14 +181,28 @@ class MemoryVault:
     def save_memory(self, memory: Memory):
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
-        cursor.execute("""INSERT OR REPLACE INTO memories 
-            (id, npc_id, memory_type, content, strength, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)""",
+        cursor.execute(_INSERT_MEMORY_SQL,
             (memory.id, memory.npc_id, memory.memory_type, 
              memory.content, memory.strength, memory.timestamp))
         conn.commit()
         conn.close()
     
+    def save_memories(self, memories: List[Memory]):
+        """Save a batch of memories in a single transaction"""
+        if not memories:
+            return
+        _write_memory_rows(self.db_path, [(m.id, m.npc_id, m.memory_type, m.content, m.strength, m.timestamp)
+                                          for m in memories])
+    
+    def save_memory_async(self, memory: Memory):
+        """Queue a memory for the shared background writer (returns immediately)"""
+        _enqueue_memory(self.db_path, (memory.id, memory.npc_id, memory.memory_type,
+                                       memory.content, memory.strength, memory.timestamp))
+    
+    def flush(self, timeout: float = 5.0):
+        """Block until every queued memory is written (call on shutdown)"""
+        flush_pending_memories(timeout)
+    
     def get_recent_memories(self, npc_id: str, limit: int = 5) -> List[Memory]:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
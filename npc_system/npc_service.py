@@ -1,5 +1,5 @@
 """Fractured Survival - Standalone NPC Service for Game Engines"""
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File, Header, Depends
+from fastapi import FastAPI, HTTPException, Query, UploadFile, File, Header, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
@@ -33,6 +33,7 @@ PERSONA_PATH.mkdir(parents=True, exist_ok=True)
 sys.path.insert(0, str(BASE_PATH))
 
 from core.npc_system import NPCSystem
+from core.limbic import rounded_summary
 from core.multi_npc import orchestrator
 from core.npc_generator import npc_generator
 from core.world_systems import quest_generator as world_quest_generator, trade_network, territory_system, faction_system
@@ -42,6 +43,7 @@ from core.scaling_system import scaling_manager
 from core.voice_system import npc_voice_system, VOICE_LIBRARY
 from core.auth_system import auth_system
 from core.conversation_groups import conversation_manager, ConversationGroup, ResponseType
+from database.memory_vault import flush_pending_memories
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -57,9 +59,9 @@ else:
 # Initialize Speech-to-Text using OpenAI-compatible adapter
 # Supports both OPENAI_API_KEY and EMERGENT_LLM_KEY
 try:
-    from core.llm_adapter import OpenAISpeechToText
+    from core.llm_adapter import OpenAISpeechToText, aclose_clients
 except ImportError:
-    from llm_adapter import OpenAISpeechToText
+    from llm_adapter import OpenAISpeechToText, aclose_clients
 
 stt_api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("EMERGENT_LLM_KEY")
 stt_client = OpenAISpeechToText(api_key=stt_api_key)
@@ -359,6 +361,31 @@ async def list_users(limit: int = 100, offset: int = 0, user: dict = Depends(req
     """List all users (admin endpoint)"""
     return auth_system.list_users(limit, offset)
 
+def _npc_voice_args(npc_id: str, npc, faction: str) -> tuple:
+    """(npc_id, role, gender, faction, personality) for voice assignment, from the NPC's persona"""
+    persona = npc.persona if hasattr(npc, 'persona') else {}
+    if isinstance(persona, dict):
+        gender = persona.get('gender', 'male')
+        role = persona.get('role', 'citizen')
+        personality = persona.get('personality', {})
+    else:
+        gender = getattr(persona, 'gender', 'male')
+        role = getattr(persona, 'role', 'citizen')
+        personality = getattr(persona, 'personality', {})
+    
+    if hasattr(personality, '__dict__'):
+        personality = vars(personality)
+    
+    return npc_id, role, gender, faction, personality if isinstance(personality, dict) else {}
+
+def _assign_npc_voice(npc_id: str, npc, faction: str):
+    """Assign an NPC's voice from its persona at registration, so speech never has to"""
+    try:
+        # Assign unique voice with correct gender
+        npc_voice_system_instance.assign_unique_voice(*_npc_voice_args(npc_id, npc, faction))
+    except Exception as voice_err:
+        print(f"Voice assignment warning for {npc_id}: {voice_err}")
+
 # Initialize NPC
 @app.post("/npc/init")
 async def initialize_npc(request: InitNPCRequest):
@@ -392,30 +419,7 @@ async def initialize_npc(request: InitNPCRequest):
         npc_tasks[npc_id] = task
         
         # Auto-assign voice based on persona gender
-        try:
-            persona = npc.persona if hasattr(npc, 'persona') else {}
-            if isinstance(persona, dict):
-                gender = persona.get('gender', 'male')
-                role = persona.get('role', 'citizen')
-                personality = persona.get('personality', {})
-            else:
-                gender = getattr(persona, 'gender', 'male')
-                role = getattr(persona, 'role', 'citizen')
-                personality = getattr(persona, 'personality', {})
-            
-            if hasattr(personality, '__dict__'):
-                personality = vars(personality)
-            
-            # Assign unique voice with correct gender
-            npc_voice_system_instance.assign_unique_voice(
-                npc_id=npc_id,
-                role=role,
-                gender=gender,
-                faction=faction,
-                personality=personality if isinstance(personality, dict) else {}
-            )
-        except Exception as voice_err:
-            print(f"Voice assignment warning for {npc_id}: {voice_err}")
+        _assign_npc_voice(npc_id, npc, faction)
         
         return {
             "status": "initialized",
@@ -434,6 +438,9 @@ async def process_action(request: ActionRequest):
         if npc_id not in npc_instances:
             raise HTTPException(status_code=404, detail="NPC not found")
         
+        # Same recorder as /batch/interact (tier promotion + cache invalidation)
+        scaling_manager.record_interactions((npc_id,))
+        
         # Get or create player session
         player = player_manager.get_or_create_player(request.player_id, request.player_name)
         
@@ -515,7 +522,7 @@ async def process_action(request: ActionRequest):
             "memories_shared": memories_shared,
             "cognitive_frame": response["cognitive_frame"],
             "limbic_state": response["limbic_state"],
-            "personality": response["personality_snapshot"]
+            "personality": dict(response["personality_snapshot"])
         }
     except HTTPException:
         raise
@@ -678,7 +685,7 @@ async def get_status(npc_id: str):
             raise HTTPException(status_code=404, detail="NPC not found")
         
         npc = npc_instances[npc_id]
-        limbic_state = npc.limbic.get_state_summary()
+        limbic_state = rounded_summary(npc.limbic.get_state_summary())
         
         return {
             "npc_id": npc_id,
@@ -1316,7 +1323,7 @@ async def generate_quest_for_npc(npc_id: str):
             raise HTTPException(status_code=404, detail="NPC not found")
         
         npc = npc_instances[npc_id]
-        limbic_state = npc.limbic.get_state_summary()
+        limbic_state = rounded_summary(npc.limbic.get_state_summary())
         
         quest = quest_generator.generate_quest_from_npc(
             npc_id=npc_id,
@@ -1372,6 +1379,7 @@ async def batch_interact(request: BatchInteractionRequest):
     start_time = time.time()
     results = []
     errors = []
+    interacted = []  # recorded for tiered updates in one pass after the loop
     
     for interaction in request.interactions:
         npc_id = interaction.get("npc_id")
@@ -1385,8 +1393,7 @@ async def batch_interact(request: BatchInteractionRequest):
             
             npc = npc_instances[npc_id]
             
-            # Record interaction for tiered updates
-            scaling_manager.record_interaction(npc_id)
+            interacted.append(npc_id)
             
             # Process action
             player = player_manager.get_or_create_player(player_id)
@@ -1401,6 +1408,8 @@ async def batch_interact(request: BatchInteractionRequest):
         except Exception as e:
             errors.append({"npc_id": npc_id, "error": str(e)})
     
+    scaling_manager.record_interactions(interacted)
+    
     processing_time = time.time() - start_time
     scaling_manager.performance.record("batch_interact", processing_time)
     
@@ -1422,6 +1431,7 @@ async def batch_init_npcs(request: BatchNPCInitRequest):
     start_time = time.time()
     initialized = []
     errors = []
+    voice_args = []
     
     # Map NPC IDs to persona files (same logic as regular init)
     persona_map = {
@@ -1449,6 +1459,10 @@ async def batch_init_npcs(request: BatchNPCInitRequest):
             faction_map = {"vera": "guards", "guard": "guards", "merchant": "traders"}
             faction = faction_map.get(npc_id.lower(), "citizens")
             orchestrator.register_npc(npc_id, npc, faction)
+            try:
+                voice_args.append(_npc_voice_args(npc_id, npc, faction))
+            except Exception as voice_err:
+                print(f"Voice assignment warning for {npc_id}: {voice_err}")
             
             # Start autonomous systems
             task = asyncio.create_task(npc.start_autonomous_systems())
@@ -1463,6 +1477,12 @@ async def batch_init_npcs(request: BatchNPCInitRequest):
         except Exception as e:
             errors.append({"npc_id": npc_id, "error": str(e)})
     
+    # One DB transaction for every new voice in the batch
+    try:
+        npc_voice_system_instance.bulk_assign_voices(voice_args)
+    except Exception as voice_err:
+        print(f"Voice assignment warning for batch init: {voice_err}")
+    
     processing_time = time.time() - start_time
     
     return {
@@ -1488,7 +1508,7 @@ async def get_npcs_paginated(
     if tier:
         tier_npcs = []
         for npc_id in all_npcs:
-            state = scaling_manager.tiered_updates._npc_states.get(npc_id)
+            state = scaling_manager.tiered_updates.get_npc_state(npc_id)
             if state and state.tier == tier:
                 tier_npcs.append(npc_id)
         all_npcs = tier_npcs
@@ -1503,7 +1523,7 @@ async def get_npcs_paginated(
     results = []
     for npc_id in page_npcs:
         npc = npc_instances.get(npc_id)
-        state = scaling_manager.tiered_updates._npc_states.get(npc_id)
+        state = scaling_manager.tiered_updates.get_npc_state(npc_id)
         
         results.append({
             "npc_id": npc_id,
@@ -1896,6 +1916,32 @@ async def generate_npc_speech(npc_id: str, request: VoiceGenerateRequest):
         }
     }
 
+@app.post("/voice/generate/{npc_id}/raw")
+async def generate_npc_speech_raw(npc_id: str, request: VoiceGenerateRequest):
+    """
+    Generate speech audio for an NPC as a binary response body.
+    Same audio as /voice/generate/{npc_id} without the base64 JSON wrapping.
+    """
+    if npc_id not in npc_instances:
+        raise HTTPException(status_code=404, detail="NPC not initialized")
+    
+    output_format = "wav" if request.format.lower() == "wav" else "mp3"
+    result = await npc_voice_system_instance.generate_voice_async(
+        npc_id=npc_id,
+        text=request.text,
+        mood=request.mood,
+        output_format=output_format,
+        encode_base64=False
+    )
+    
+    if not result:
+        raise HTTPException(status_code=500, detail="Failed to generate voice audio")
+    
+    return Response(
+        content=result["audio"],
+        media_type="audio/wav" if output_format == "wav" else "audio/mpeg"
+    )
+
 @app.post("/voice/clone/{npc_id}")
 async def clone_voice_for_npc(npc_id: str, request: VoiceCloneRequest):
     """
@@ -2104,6 +2150,7 @@ async def voice_interact_with_npc(
         # Step 2: Get NPC response
         npc = npc_instances[npc_id]
         player = player_manager.get_or_create_player(player_id, player_name)
+        scaling_manager.record_interactions((npc_id,))
         
         # Process action
         response = await npc.process_player_action(player_text)
@@ -2283,7 +2330,18 @@ async def init_conversation_manager():
     """Initialize conversation manager with NPC instances reference"""
     # This will be called when the app starts
     # The actual NPC instances will be set when NPCs are initialized
-    pass
+    await orchestrator.start()
+
+@app.on_event("shutdown")
+async def close_llm_clients():
+    """Close pooled OpenAI connections"""
+    await aclose_clients()
+
+@app.on_event("shutdown")
+async def flush_pending_writes():
+    """Write out NPC memories still queued in the write-behind"""
+    await orchestrator.stop()
+    await asyncio.to_thread(flush_pending_memories)
 
 def ensure_conversation_manager_initialized():
     """Ensure conversation manager has access to NPC instances and voice system"""
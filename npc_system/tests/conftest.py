@@ -0,0 +1,7 @@
+"""Shared pytest setup: make the npc_system packages (core, database) importable"""
+import sys
+from pathlib import Path
+
+NPC_SYSTEM_DIR = Path(__file__).resolve().parent.parent
+if str(NPC_SYSTEM_DIR) not in sys.path:
+    sys.path.insert(0, str(NPC_SYSTEM_DIR))
@@ -0,0 +1,47 @@
+"""Unit tests for the memory vault's shared write-behind queue"""
+import time
+
+from database import memory_vault
+from database.memory_vault import Memory, MemoryVault, flush_pending_memories
+
+
+def _memory(i, npc_id="vera"):
+    return Memory(f"{npc_id}-{i}", npc_id, "interaction", f"memory {i}", 1.0,
+                  f"2024-01-01T00:00:{i:02d}")
+
+
+class TestWriteBehind:
+    """Queued memories reach disk on flush and on a fixed deadline"""
+    
+    def test_flush_writes_every_vault(self, tmp_path):
+        vera = MemoryVault(str(tmp_path / "vera.db"))
+        guard = MemoryVault(str(tmp_path / "guard.db"))
+        for i in range(5):
+            vera.save_memory_async(_memory(i))
+            guard.save_memory_async(_memory(i, "guard"))
+        
+        # What the service's shutdown hook calls
+        flush_pending_memories()
+        
+        assert len(vera.get_recent_memories("vera", limit=10)) == 5
+        assert len(guard.get_recent_memories("guard", limit=10)) == 5
+    
+    def test_steady_trickle_is_written_by_deadline(self, tmp_path, monkeypatch):
+        vault = MemoryVault(str(tmp_path / "vera.db"))
+        flushed_at = []
+        flush_batches = memory_vault._flush_batches
+        monkeypatch.setattr(memory_vault, "_flush_batches",
+                            lambda batches: (flushed_at.append(time.monotonic()),
+                                             flush_batches(batches)))
+        monkeypatch.setattr(memory_vault, "WRITE_INTERVAL", 0.1)
+        
+        # Writes closer together than WRITE_INTERVAL, fewer than WRITE_BATCH
+        start = time.monotonic()
+        for i in range(20):
+            vault.save_memory_async(_memory(i))
+            time.sleep(0.02)
+        
+        assert flushed_at, "nothing was written while writes kept arriving"
+        assert flushed_at[0] - start < 0.3
+        flush_pending_memories()
+        assert len(vault.get_recent_memories("vera", limit=50)) == 20
@@ -0,0 +1,67 @@
+"""Unit tests for MultiNPCOrchestrator vitals and trust storage"""
+from types import SimpleNamespace
+
+import pytest
+
+from core.limbic import Vitals
+from core.multi_npc import MultiNPCOrchestrator
+
+
+def _npc(vitals=None):
+    return SimpleNamespace(limbic=SimpleNamespace(vitals=vitals))
+
+
+class TestTickVitals:
+    """Vectorized vitals decay"""
+    
+    def test_tick_matches_vitals_decay(self):
+        orchestrator = MultiNPCOrchestrator()
+        vitals, reference = Vitals(), Vitals()
+        orchestrator.register_npc("vera", _npc(vitals))
+        
+        for _ in range(20):
+            orchestrator.tick_vitals(1.0)
+            reference.decay(1.0)
+        
+        assert vitals.hunger == reference.hunger
+        assert vitals.fatigue == reference.fatigue
+    
+    def test_eating_between_ticks_is_kept(self):
+        orchestrator = MultiNPCOrchestrator()
+        vitals = Vitals(hunger=0.8)
+        orchestrator.register_npc("vera", _npc(vitals))
+        
+        orchestrator.tick_vitals(60.0)
+        before_meal = vitals.hunger
+        vitals.hunger = 0.1  # NPC eats
+        orchestrator.tick_vitals(60.0)
+        
+        assert vitals.hunger < before_meal
+        assert vitals.hunger == pytest.approx(0.1 + 60.0 / Vitals.STARVE_SECONDS)
+
+
+class TestTrustMatrix:
+    """Dense trust matrix indexed by registration order"""
+    
+    def test_growth_keeps_trust(self):
+        orchestrator = MultiNPCOrchestrator()
+        initial = orchestrator._trust.shape[0]
+        orchestrator.register_npc("guard0", _npc(), "guards")
+        orchestrator.register_npc("trader0", _npc(), "traders")
+        orchestrator.modify_trust("guard0", "trader0", 0.05)
+        
+        # Past two doublings of the initial capacity
+        for i in range(1, 2 * initial + 5):
+            orchestrator.register_npc(f"guard{i}", _npc(Vitals(hunger=0.25)), "guards")
+        
+        assert orchestrator._trust.shape[0] == 4 * initial
+        assert len(orchestrator._hunger) == len(orchestrator._fatigue) == 4 * initial
+        assert orchestrator.get_trust("guard0", "trader0") == pytest.approx(0.35)
+        assert orchestrator.get_trust("trader0", "guard0") == pytest.approx(0.3)
+        
+        last = f"guard{2 * initial + 4}"
+        assert orchestrator.get_trust(last, "guard0") == 0.6
+        assert orchestrator.get_trust("trader0", last) == 0.3
+        assert orchestrator._hunger[orchestrator._idx[last]] == 0.25
+        assert orchestrator._calculate_faction_trust(orchestrator.factions["guards"]) == pytest.approx(0.6)
+        assert len(orchestrator.trust_matrix) == 2 * initial + 6
@@ -0,0 +1,214 @@
+"""Unit tests for the scaling system's batch writer and cache"""
+import sqlite3
+import time
+
+import pytest
+
+from core.scaling_system import (
+    BatchOperationsManager, ConnectionPool, GlobalScalingManager, IndexManager, TTLCache,
+)
+
+
+@pytest.fixture
+def batch_ops(tmp_path):
+    db_path = str(tmp_path / "scaling.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v INTEGER)")
+    conn.commit()
+    conn.close()
+    pool = ConnectionPool(db_path, pool_size=2)
+    ops = BatchOperationsManager(pool)
+    # Stop the background writer so the tests decide when flushes happen
+    ops._running = False
+    ops._wake.set()
+    ops._writer_thread.join()
+    yield ops
+    ops.close()
+    pool.close_all()
+
+
+def _rows(ops, sql="SELECT k, v FROM kv ORDER BY k"):
+    with ops.pool.get_connection() as conn:
+        return [tuple(row) for row in conn.execute(sql)]
+
+
+class TestBatchWriterFailures:
+    """Failed flushes roll back and are retried"""
+    
+    def test_failed_commit_rolls_back(self, batch_ops):
+        conn = batch_ops._writer_conn
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+        conn.execute("""CREATE TABLE child (id INTEGER PRIMARY KEY, parent_id INTEGER
+            REFERENCES parent(id) DEFERRABLE INITIALLY DEFERRED)""")
+        
+        # Deferred FK violation: the statement succeeds, COMMIT fails
+        batch_ops.queue_write("INSERT INTO child VALUES (?, ?)", (1, 99))
+        for _ in range(BatchOperationsManager.MAX_FLUSH_ATTEMPTS):
+            with pytest.raises(sqlite3.IntegrityError):
+                batch_ops.flush()
+            assert not conn.in_transaction
+        
+        # Dropped after MAX_FLUSH_ATTEMPTS; the writer is usable again
+        batch_ops.queue_write("INSERT INTO kv VALUES (?, ?)", ("a", 1))
+        batch_ops.flush()
+        assert _rows(batch_ops) == [("a", 1)]
+    
+    def test_failed_batch_is_retried(self, batch_ops):
+        batch_ops.queue_write("INSERT INTO later VALUES (?)", (1,))
+        batch_ops.queue_write("INSERT INTO kv VALUES (?, ?)", ("a", 1))
+        with pytest.raises(sqlite3.OperationalError):
+            batch_ops.flush()
+        
+        batch_ops._writer_conn.execute("CREATE TABLE later (x INTEGER)")
+        batch_ops.flush()
+        assert _rows(batch_ops) == [("a", 1)]
+        assert _rows(batch_ops, "SELECT x FROM later") == [(1,)]
+
+
+class TestBatchWriterOrdering:
+    """Batches are bounded by _batch_size and keep queue order"""
+    
+    UPSERT = "INSERT INTO kv VALUES (?, ?) ON CONFLICT(k) DO UPDATE SET v = excluded.v"
+    
+    def test_flush_splits_into_batch_size_transactions(self, batch_ops, monkeypatch):
+        sizes = []
+        flush_writes = batch_ops._flush_writes
+        monkeypatch.setattr(batch_ops, "_flush_writes",
+                            lambda writes: (sizes.append(len(writes)), flush_writes(writes)))
+        batch_ops._batch_size = 4
+        
+        for i in range(10):
+            batch_ops.queue_write(self.UPSERT, (f"k{i}", i))
+        batch_ops.flush()
+        
+        assert sizes == [4, 4, 2]
+        assert len(_rows(batch_ops)) == 10
+    
+    def test_upserts_apply_in_queue_order(self, batch_ops):
+        batch_ops._batch_size = 3
+        for v in range(7):
+            batch_ops.queue_write(self.UPSERT, ("same", v))
+        batch_ops.queue_write("DELETE FROM kv WHERE k = ?", ("same",))
+        batch_ops.queue_write(self.UPSERT, ("same", 42))
+        batch_ops.flush()
+        
+        assert _rows(batch_ops) == [("same", 42)]
+
+
+class TestBatchWriterThread:
+    """Background writer sleeps while idle and wakes on the first write"""
+    
+    def test_idle_writer_flushes_first_write(self, tmp_path):
+        db_path = str(tmp_path / "writer.db")
+        pool = ConnectionPool(db_path, pool_size=1)
+        ops = BatchOperationsManager(pool)
+        try:
+            ops.flush()
+            ops._writer_conn.execute("CREATE TABLE kv (k TEXT PRIMARY KEY, v INTEGER)")
+            flushes = []
+            flush = ops.flush
+            ops.flush = lambda: (flushes.append(1), flush())
+            
+            time.sleep(0.2)  # Idle: the writer must not be polling
+            assert ops._idle
+            assert len(flushes) <= 1
+            
+            ops.queue_write("INSERT INTO kv VALUES (?, ?)", ("a", 1))
+            deadline = time.monotonic() + 2.0
+            while not _rows(ops) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert _rows(ops) == [("a", 1)]
+        finally:
+            ops.close()
+            pool.close_all()
+
+
+class TestPartialIndex:
+    """Memory decay searches the live-rows partial index"""
+    
+    def test_decay_uses_live_index(self, batch_ops):
+        conn = batch_ops._writer_conn
+        conn.execute("""CREATE TABLE conversation_topics (id INTEGER PRIMARY KEY,
+            npc_id TEXT, player_id TEXT, current_strength REAL, decay_rate REAL)""")
+        # Mostly faded memories, as after a long session
+        conn.executemany(
+            "INSERT INTO conversation_topics (npc_id, current_strength, decay_rate) VALUES (?, ?, 1.0)",
+            [("vera", 0.5), ("vera", 1.0)] + [("vera", 0.05)] * 500
+        )
+        conn.commit()
+        IndexManager.create_indexes(batch_ops.pool)
+        
+        with batch_ops.pool.get_connection() as reader:
+            plan = reader.execute("""EXPLAIN QUERY PLAN UPDATE conversation_topics
+                SET current_strength = 0 WHERE current_strength > 0.1 AND current_strength > ?""",
+                (0.2,)).fetchall()
+        assert "idx_conversation_topics_live" in plan[0]["detail"]
+        
+        assert batch_ops.batch_memory_decay(0.5, min_strength=0.2) == 2
+        assert _rows(batch_ops, "SELECT current_strength FROM conversation_topics WHERE id <= 3") == [
+            (0.25,), (0.5,), (0.05,)
+        ]
+
+
+class TestRecordInteractions:
+    """Single and batch interactions go through record_interactions"""
+    
+    def test_interactions_promote_and_invalidate(self, tmp_path):
+        manager = GlobalScalingManager(str(tmp_path / "scaling.db"))
+        try:
+            for npc_id in ("vera", "guard", "merchant"):
+                manager.register_npc(npc_id)
+                manager.get_cached_or_fetch(f"npc:{npc_id}:data", lambda: npc_id)
+            
+            manager.record_interactions(("vera",))  # /npc/action
+            manager.record_interactions(["guard", "guard", "ghost"])  # /batch/interact
+            
+            for npc_id, count in (("vera", 1), ("guard", 2)):
+                state = manager.tiered_updates.get_npc_state(npc_id)
+                assert state.tier == "active"
+                assert state.interaction_count_recent == count
+                assert manager.cache.get(f"npc:{npc_id}:data") is None
+            assert manager.tiered_updates.get_npc_state("merchant").interaction_count_recent == 0
+            assert manager.cache.get("npc:merchant:data") == "merchant"
+        finally:
+            manager.batch_ops.close()
+            manager.connection_pool.close_all()
+
+
+class TestCacheTags:
+    """invalidate_tag drops exactly the keys set under a tag"""
+    
+    def test_invalidate_tag(self):
+        cache = TTLCache(max_size=100)
+        cache.set("npc:vera:data", 1, "npc:vera")
+        cache.set("npc:vera:mood", 2, "npc:vera")
+        cache.set("npc:guard:data", 3, "npc:guard")
+        cache.set("world:time", 4)
+        
+        cache.invalidate_tag("npc:vera")
+        assert cache.get("npc:vera:data") is None
+        assert cache.get("npc:vera:mood") is None
+        assert cache.get("npc:guard:data") == 3
+        assert cache.get("world:time") == 4
+        
+        cache.invalidate_tag("npc:vera")  # Already gone: no-op
+        cache.set("npc:vera:data", 5, "npc:vera")  # Re-tagged after invalidation
+        cache.invalidate_tag("npc:vera")
+        assert cache.get("npc:vera:data") is None
+    
+    def test_invalidate_tags(self):
+        cache = TTLCache(max_size=100)
+        for npc_id in ("vera", "guard", "merchant"):
+            cache.set(f"npc:{npc_id}:data", npc_id, f"npc:{npc_id}")
+        
+        cache.invalidate_tags({"npc:vera", "npc:guard", "npc:ghost"})
+        assert cache.get("npc:vera:data") is None
+        assert cache.get("npc:guard:data") is None
+        assert cache.get("npc:merchant:data") == "merchant"
+    
+    def test_clear_drops_tag_index(self):
+        cache = TTLCache(max_size=100)
+        cache.set("npc:vera:data", 1, "npc:vera")
+        cache.clear()
+        assert cache._tag_index == {}
@@ -0,0 +1,98 @@
+"""Unit tests for voice fingerprint modifiers"""
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("elevenlabs")
+
+from core import voice_system
+from core.voice_system import (
+    NPCVoiceSystem, _TRAIT_ORDER, _compute_mods, _compute_mods_batch, _compute_mods_batch_numpy,
+    calculate_voice_fingerprint, calculate_voice_fingerprints,
+)
+
+
+@pytest.fixture
+def traits():
+    rng = np.random.default_rng(7)
+    # Random personalities plus the extremes that hit every clamp
+    return np.vstack([
+        rng.random((64, len(_TRAIT_ORDER))),
+        np.zeros(len(_TRAIT_ORDER)),
+        np.ones(len(_TRAIT_ORDER)),
+    ])
+
+
+class TestModifierKernels:
+    """The scalar, NumPy and numba paths compute the same modifiers"""
+    
+    def test_numpy_kernel_matches_scalar(self, traits):
+        out = np.empty((len(traits), 4))
+        _compute_mods_batch_numpy(traits, out)
+        scalar = [_compute_mods("guard", "male", tuple(row))[1:5] for row in traits.tolist()]
+        np.testing.assert_allclose(out, scalar, rtol=0, atol=1e-12)
+    
+    def test_batch_kernel_matches_numpy(self, traits):
+        out, expected = np.empty((len(traits), 4)), np.empty((len(traits), 4))
+        _compute_mods_batch(traits, out)
+        _compute_mods_batch_numpy(traits, expected)
+        np.testing.assert_allclose(out, expected, rtol=0, atol=1e-12)
+    
+    def test_bulk_fingerprints_match_single(self, traits):
+        npcs = [(f"npc{i}", dict(zip(_TRAIT_ORDER, row)), "merchant", "female")
+                for i, row in enumerate(traits.tolist())]
+        bulk = calculate_voice_fingerprints(npcs)
+        single = [calculate_voice_fingerprint(*npc) for npc in npcs]
+        assert bulk == single
+        assert all(type(fp.stability_mod) is float for fp in single)
+
+
+@pytest.fixture
+def voice(tmp_path, monkeypatch):
+    monkeypatch.setattr(voice_system, "VOICE_DB_PATH", str(tmp_path / "voices.db"))
+    return NPCVoiceSystem(api_key="")
+
+
+def _key(i):
+    return f"{i:064x}"
+
+
+class TestAudioCache:
+    """Generated clips are bounded by total size in memory and on disk"""
+    
+    def test_memory_cache_is_capped_by_bytes(self, voice):
+        voice.AUDIO_CACHE_BYTES = 10
+        for i in range(3):
+            voice._cache_audio(_key(i), b"x" * 4)
+        
+        assert voice._get_cached_audio(_key(0)) is None
+        assert voice._get_cached_audio(_key(1)) == b"xxxx"
+        assert voice._audio_cache_bytes == 8
+        
+        voice._cache_audio(_key(1), b"y" * 7)  # Replacing a clip re-counts it
+        assert list(voice._audio_cache) == [_key(1)]
+        assert voice._audio_cache_bytes == 7
+    
+    def test_disk_cache_evicts_least_recently_used(self, voice, tmp_path, monkeypatch):
+        monkeypatch.setattr(voice_system, "VOICE_AUDIO_CACHE_MAX_BYTES", 100)
+        voice._audio_cache_dir = tmp_path / "audio"
+        
+        def write(i):
+            voice._cache_audio(_key(i), b"x" * 30)
+            path = voice._audio_cache_path(_key(i))
+            if path.exists():
+                os.utime(path, (1000 + i, 1000 + i))
+        
+        for i in range(4):
+            write(i)
+        # 120 bytes > 100: the oldest clip goes, leaving 90 (the 90% target)
+        assert not voice._audio_cache_path(_key(0)).exists()
+        assert voice._disk_cache_bytes == 90
+        
+        # A disk hit makes clip 1 the most recent, so clip 2 is evicted next
+        voice._audio_cache.clear()
+        assert voice._get_cached_audio(_key(1)) == b"x" * 30
+        write(4)
+        remaining = sorted(p.stem for p in voice._audio_cache_dir.glob("*/*.audio"))
+        assert remaining == sorted(_key(i) for i in (1, 3, 4))
@@ -0,0 +1,153 @@
+"""Unit tests for WebSocket voice streaming"""
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+pytest.importorskip("fastapi")
+
+from core.websocket_handler import MessageType, WebSocketHandler, ws_manager
+
+CHUNK = 16384
+# Empty-tail, exact-boundary and ragged-tail sizes around the 16 KB chunk
+SIZES = [1, CHUNK - 1, CHUNK, CHUNK + 1, 3 * CHUNK + 7]
+
+
+class FakeWebSocket:
+    """Records every frame: dicts for text frames, bytes for binary ones"""
+    
+    def __init__(self):
+        self.frames = []
+    
+    async def accept(self):
+        pass
+    
+    async def send_text(self, data):
+        self.frames.append(orjson.loads(data))
+    
+    async def send_bytes(self, data):
+        self.frames.append(bytes(data))
+
+
+class FakeVoiceSystem:
+    def __init__(self, audio):
+        self.audio = audio
+    
+    async def generate_speech_async(self, **kwargs):
+        return self.audio
+
+
+class FakeConversationManager:
+    """One NPC reply whose voice is the given audio"""
+    
+    def __init__(self, audio):
+        self.audio = audio
+    
+    async def process_player_message(self, group_id, message, target_npc_id=None):
+        return [SimpleNamespace(speaker_id="vera", speaker_name="Vera", content="Halt!",
+                                response_type="direct_reply", target_id="player", mood="stern",
+                                inner_thoughts="", timestamp=0.0)]
+    
+    def get_conversation(self, group_id):
+        return None
+    
+    async def generate_voice_for_responses(self, responses, audio_format, encode_base64):
+        return [{"npc_id": "vera", "npc_name": "Vera", "audio_bytes": self.audio}]
+
+
+def _audio(size):
+    return bytes(i % 251 for i in range(size))
+
+
+@pytest.fixture
+def stream():
+    """(send(message, audio[, handler]) -> frames) against a connected fake client"""
+    websocket = FakeWebSocket()
+    client = asyncio.run(ws_manager.connect(websocket, "tester"))
+    npcs = {"vera": SimpleNamespace(persona={"role": "guard", "personality": {}})}
+    
+    def send(message, audio, handler_name="_handle_voice_generate"):
+        handler = WebSocketHandler(npcs, FakeVoiceSystem(audio), None, None, None, None, None,
+                                   conversation_manager=FakeConversationManager(audio))
+        websocket.frames.clear()
+        result = asyncio.run(getattr(handler, handler_name)(client, message))
+        if result is not None:  # The dispatcher would send it
+            websocket.frames.append(result)
+        return list(websocket.frames)
+    
+    yield send
+    ws_manager.disconnect("tester")
+
+
+class TestBinaryVoiceStream:
+    """binary=True: one JSON header, then the audio as raw binary frames"""
+    
+    @pytest.mark.parametrize("size", SIZES)
+    def test_frames_reassemble(self, stream, size):
+        audio = _audio(size)
+        frames = stream({"npc_id": "vera", "text": "Halt!", "format": "mp3", "binary": True}, audio)
+        
+        header, *chunks, complete = frames
+        assert header["type"] == MessageType.VOICE_CHUNK_BIN
+        assert header["total_chunks"] == len(chunks) == -(-size // CHUNK)
+        assert header["total_size"] == size
+        assert all(len(chunk) == CHUNK for chunk in chunks[:-1])
+        assert 0 < len(chunks[-1]) <= CHUNK
+        assert b"".join(chunks) == audio
+        assert complete["type"] == MessageType.VOICE_COMPLETE
+
+
+def _decode_chunks(chunks):
+    """Decode each base64 chunk on its own, as a client may"""
+    decoded = []
+    for chunk in chunks:
+        assert len(chunk) % 4 == 0
+        decoded.append(base64.b64decode(chunk, validate=True))
+    return decoded
+
+
+class TestBase64VoiceStream:
+    """Default mode: base64 text chunks that each decode independently"""
+    
+    @pytest.mark.parametrize("size", SIZES)
+    def test_voice_generate_chunks_decode(self, stream, size):
+        audio = _audio(size)
+        *chunks, complete = stream({"npc_id": "vera", "text": "Halt!", "format": "mp3"}, audio)
+        
+        assert [c["type"] for c in chunks] == [MessageType.VOICE_CHUNK] * len(chunks)
+        assert [c["chunk_index"] for c in chunks] == list(range(len(chunks)))
+        assert all(c["total_chunks"] == len(chunks) for c in chunks)
+        decoded = _decode_chunks(c["audio_data"] for c in chunks)
+        assert all(len(part) <= CHUNK for part in decoded)
+        assert b"".join(decoded) == audio
+        assert complete["total_size"] == size
+    
+    @pytest.mark.parametrize("size", SIZES)
+    def test_conversation_chunks_decode(self, stream, size, monkeypatch):
+        pytest.importorskip("elevenlabs")
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")  # conversation_groups builds a client on import
+        audio = _audio(size)
+        frames = stream({"group_id": "g1", "message": "Hello", "with_voice": True},
+                        audio, "_handle_conversation_message")
+        
+        responses, *chunks, complete = frames
+        assert responses["voice_count"] == 1
+        assert complete["type"] == "conversation_voice_complete"
+        assert complete["total_chunks"] == len(chunks)
+        decoded = _decode_chunks(c["audio_chunk"] for c in chunks)
+        assert b"".join(decoded) == audio
+    
+    def test_conversation_binary_frames(self, stream, monkeypatch):
+        pytest.importorskip("elevenlabs")
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        audio = _audio(2 * CHUNK + 5)
+        frames = stream({"group_id": "g1", "message": "Hello", "with_voice": True, "binary": True},
+                        audio, "_handle_conversation_message")
+        
+        _, header, *chunks, complete = frames
+        assert header["type"] == "conversation_voice_chunk_bin"
+        assert header["total_chunks"] == len(chunks) == 3
+        assert b"".join(chunks) == audio
+        assert complete["type"] == "conversation_voice_complete"